@@ -0,0 +1,185 @@
+# Summary: Compact on-disk container for barcode images. Pixels are stored
+# bit-packed behind a fixed header and an index of offsets and sizes, so any
+# record can be memory-mapped and decoded by index without reading the file.
+import mmap
+import struct
+
+import numpy as np
+
+from stars_and_stripes import BarcodeImage, InfoBox
+
+class BarcodeArchiveFormat:
+    """Describes the layout shared by the archive reader and writer.
+    ...
+    Layout
+    ----------
+    header: HEADER_STRUCT
+        Magic bytes, format version, record count and the byte offset of
+        the index.
+    records:
+        The pixels of every image, one after another, each row packed eight
+        pixels per byte (np.packbits along the rows).
+    index: INDEX_DTYPE[count]
+        The byte offset, width and height of every record.
+    ----------
+    Misc Variables
+        MAGIC: bytes
+            Identifies a barcode archive.
+        VERSION: int
+            The layout version written to the header.
+        HEADER_STRUCT: struct.Struct
+            Magic, version, reserved, record count, index offset.
+        INDEX_DTYPE: np.dtype
+            One index entry: byte offset, width, height, reserved.
+    """
+    MAGIC: bytes = b"SSBA"
+    VERSION: int = 1
+    HEADER_STRUCT = struct.Struct("<4sHHIQ")
+    INDEX_DTYPE = np.dtype([("offset", "<u8"), ("width", "<u4"),
+                            ("height", "<u2"), ("reserved", "<u2")])
+
+class BarcodeArchiveWriter(BarcodeArchiveFormat):
+    """Writes barcode images to a new archive. Records are appended as they
+    are added and the index is written when the writer is closed.
+    ...
+    Attributes
+    ----------
+    file: io.BufferedWriter
+        The archive being written.
+    index: list
+        The (offset, width, height, reserved) entry of every record so far.
+
+    Methods
+    ----------
+    Mutators
+        add_image(image):
+            Appends a BarcodeImage or 2D pixel array and returns its index.
+        add_stack(stack, widths):
+            Appends every image of an (N, H, W) stack, cropped to its width,
+            and returns the index of the first one.
+        close():
+            Writes the index and header and closes the file.
+    """
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.index = []
+        # reserve the header, it is filled in once the index offset is known
+        self.file.write(b"\0" * self.HEADER_STRUCT.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # mutators -----------------------------------------------------------
+    def add_image(self, image):
+        """Appends a BarcodeImage or 2D pixel array and returns its index."""
+        if isinstance(image, BarcodeImage):
+            image = image.image_data
+        height, width = image.shape
+        self.index.append((self.file.tell(), width, height, 0))
+        self.file.write(np.packbits(image, axis=1).tobytes())
+        return len(self.index) - 1
+
+    def add_stack(self, stack, widths):
+        """Appends every image of an (N, H, W) stack, cropped to its width,
+        and returns the index of the first one."""
+        first_index = len(self.index)
+        for pixels, width in zip(stack, widths):
+            self.add_image(pixels[:, :width])
+        return first_index
+
+    def close(self):
+        """Writes the index and header and closes the file."""
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.index, dtype=self.INDEX_DTYPE).tobytes())
+        self.file.seek(0)
+        self.file.write(self.HEADER_STRUCT.pack(self.MAGIC, self.VERSION, 0,
+                                                len(self.index), index_offset))
+        self.file.close()
+
+class BarcodeArchive(BarcodeArchiveFormat):
+    """Memory-maps an archive for random access. Only the pages of the
+    records that are actually read get loaded from disk.
+    ...
+    Attributes
+    ----------
+    buffer: mmap.mmap
+        The read-only mapping of the archive.
+    index: np.ndarray
+        A zero-copy view of the index entries in the mapping.
+
+    Methods
+    ----------
+    Accessors
+        __len__():
+            Returns the number of records in the archive.
+        get_packed(index):
+            Returns a zero-copy view of a record's packed rows. The view
+            must be released before the archive is closed.
+        get_image(index):
+            Returns a record as a BarcodeImage.
+        get_info_box(index):
+            Returns a record scanned into an InfoBox.
+        decode(index):
+            Decodes a record and returns its text.
+    Mutators
+        close():
+            Releases the mapping.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, index_offset = (
+            self.HEADER_STRUCT.unpack_from(self.buffer))
+        if magic != self.MAGIC or version != self.VERSION:
+            self.buffer.close()
+            raise ValueError(f"{path} is not a version {self.VERSION} "
+                             "barcode archive")
+        self.index = np.frombuffer(self.buffer, dtype=self.INDEX_DTYPE,
+                                   count=count, offset=index_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # accessors ----------------------------------------------------------
+    def __len__(self):
+        """Returns the number of records in the archive."""
+        return len(self.index)
+
+    def get_packed(self, index):
+        """Returns a zero-copy view of a record's packed rows."""
+        offset, width, height, _ = self.index[index]
+        row_bytes = (int(width) + 7) // 8
+        packed = np.frombuffer(self.buffer, dtype=np.uint8,
+                               count=int(height) * row_bytes, offset=int(offset))
+        return packed.reshape(int(height), row_bytes)
+
+    def get_image(self, index):
+        """Returns a record as a BarcodeImage."""
+        return BarcodeImage.from_packed(self.get_packed(index),
+                                        int(self.index[index]["width"]))
+
+    def get_info_box(self, index):
+        """Returns a record scanned into an InfoBox."""
+        return InfoBox(self.get_image(index))
+
+    def decode(self, index):
+        """Decodes a record and returns its text."""
+        info_box = self.get_info_box(index)
+        info_box.translate_image_to_text()
+        return info_box.text
+
+    # mutators -----------------------------------------------------------
+    def close(self):
+        """Releases the mapping. Raises BufferError while views returned by
+        get_packed are still alive."""
+        # drop the index view first, a mapping with live views can't close
+        self.index = self.index[:0].copy()
+        self.buffer.close()
@@ -0,0 +1,220 @@
+# Summary: Micro-benchmarks for barcode encoding, decoding, parsing, scanning
+# and rendering across message lengths. Reports operations per second and the
+# memory every operation allocates, and saves runs as JSON for comparing
+# commits.
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from stars_and_stripes import BarcodeImage, InfoBox
+
+class BarcodeBenchmark:
+    """Times every barcode operation at a range of message lengths. Each
+    operation is repeated until a round lasts at least min_time, the best of
+    several rounds gives the rate, and one extra call under tracemalloc gives
+    the memory it allocates. Caching is switched off while benchmarking.
+    ...
+    Attributes
+    ----------
+    lengths: list
+        The message lengths to benchmark, in characters.
+    batch_size: int
+        The number of messages in every batch operation.
+    min_time: float
+        The shortest time in seconds a timing round may take.
+    rounds: int
+        The number of timing rounds per case, the fastest one is reported.
+    ----------
+    Misc Variables
+        DEFAULT_LENGTHS: list
+            Lengths from a single character up to the widest image allowed.
+        DEFAULT_BATCH_SIZE: int
+            The number of messages per batch by default.
+        DEFAULT_MIN_TIME: float
+            The shortest timing round by default.
+        DEFAULT_ROUNDS: int
+            The number of timing rounds by default.
+        REGRESSION_THRESHOLD: float
+            The slowdown, as a share of the baseline rate, reported as a
+            regression by default.
+
+    Methods
+    ----------
+    Accessors
+        run():
+            Runs every case at every length and returns the results as a
+            JSON-ready dict.
+        get_cases(length):
+            Returns the name, per-call item count and callable of every case
+            at one message length.
+        measure(function, items):
+            Times one callable and traces its allocations and returns the
+            measurements.
+        compare(results, baseline, threshold):
+            Returns the cases that got slower than the baseline by more than
+            the threshold.
+    Instance Helpers
+        get_environment():
+            Returns the interpreter, NumPy and commit a run was made with.
+    """
+    DEFAULT_LENGTHS: list = [1, 4, 16, 64, 256, 1024, 4096,
+                             BarcodeImage.MAX_WIDTH - 2]
+    DEFAULT_BATCH_SIZE: int = 256
+    DEFAULT_MIN_TIME: float = 0.2
+    DEFAULT_ROUNDS: int = 3
+    REGRESSION_THRESHOLD: float = 0.1
+
+    def __init__(self, lengths = None, batch_size = None, min_time = None,
+                 rounds = None):
+        self.lengths = lengths or BarcodeBenchmark.DEFAULT_LENGTHS
+        self.batch_size = batch_size or BarcodeBenchmark.DEFAULT_BATCH_SIZE
+        self.min_time = min_time or BarcodeBenchmark.DEFAULT_MIN_TIME
+        self.rounds = rounds or BarcodeBenchmark.DEFAULT_ROUNDS
+
+    # accessors ----------------------------------------------------------
+    def run(self):
+        """Runs every case at every length and returns the results as a
+        JSON-ready dict."""
+        cache, InfoBox.cache = InfoBox.cache, None
+        try:
+            results = []
+            for length in self.lengths:
+                for name, items, function in self.get_cases(length):
+                    results.append({"case": name, "length": length,
+                                    **self.measure(function, items)})
+        finally:
+            InfoBox.cache = cache
+        return {"environment": self.get_environment(), "results": results}
+
+    def get_cases(self, length):
+        """Returns the name, per-call item count and callable of every case
+        at one message length."""
+        text = "".join(chr(32 + index % 95) for index in range(length))
+        encoder = InfoBox(None, text)
+        encoder.generate_image_from_text()
+        image = encoder.image
+        lines = encoder.render_image(frame=False).splitlines()
+        messages = [text] * self.batch_size
+        stack, _ = InfoBox.encode_batch(messages)
+        decoder = InfoBox(image)
+        scanner = InfoBox()
+        return [
+            ("encode", 1, encoder.generate_image_from_text),
+            ("decode", 1, decoder.translate_image_to_text),
+            ("encode_batch", self.batch_size,
+             lambda: InfoBox.encode_batch(messages)),
+            ("decode_batch", self.batch_size,
+             lambda: InfoBox.decode_batch(stack)),
+            ("parse_strings", 1, lambda: BarcodeImage(lines)),
+            ("scan", 1, lambda: scanner.scan(image)),
+            ("scan_isolated", 1, lambda: scanner.scan(image, isolate=True)),
+            ("render", 1, lambda: decoder.display_image_to_console(
+                io.StringIO())),
+        ]
+
+    def measure(self, function, items):
+        """Times one callable and traces its allocations and returns the
+        measurements."""
+        # find a call count that makes a round last at least min_time
+        calls = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(calls):
+                function()
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.min_time:
+                break
+            calls *= 2 if elapsed <= 0 else max(2, min(
+                10, int(self.min_time / elapsed) + 1))
+        best = elapsed
+        for _ in range(self.rounds - 1):
+            start = time.perf_counter()
+            for _ in range(calls):
+                function()
+            best = min(best, time.perf_counter() - start)
+        # one more call to see what it allocates, and what it keeps
+        tracemalloc.start()
+        try:
+            function()
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        seconds = best / calls
+        return {"ops_per_sec": items / seconds, "seconds_per_call": seconds,
+                "items_per_call": items, "peak_bytes": peak,
+                "retained_bytes": retained}
+
+    def compare(self, results, baseline, threshold = None):
+        """Returns the cases that got slower than the baseline by more than
+        the threshold."""
+        threshold = (BarcodeBenchmark.REGRESSION_THRESHOLD
+                     if threshold is None else threshold)
+        before = {(row["case"], row["length"]): row["ops_per_sec"]
+                  for row in baseline["results"]}
+        regressions = []
+        for row in results["results"]:
+            old_rate = before.get((row["case"], row["length"]))
+            if old_rate and row["ops_per_sec"] < old_rate * (1 - threshold):
+                regressions.append({"case": row["case"],
+                                    "length": row["length"],
+                                    "baseline_ops_per_sec": old_rate,
+                                    "ops_per_sec": row["ops_per_sec"],
+                                    "ratio": row["ops_per_sec"] / old_rate})
+        return regressions
+
+    # instance helpers ---------------------------------------------------
+    def get_environment(self):
+        """Returns the interpreter, NumPy and commit a run was made with."""
+        try:
+            commit = subprocess.run(["git", "rev-parse", "HEAD"],
+                                    capture_output=True, text=True,
+                                    check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {"python": platform.python_version(),
+                "numpy": np.__version__, "machine": platform.machine(),
+                "commit": commit,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark barcode encoding, decoding and rendering.")
+    parser.add_argument("--lengths", type=int, nargs="+",
+                        help="message lengths to benchmark")
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--min-time", type=float)
+    parser.add_argument("--output", help="write the results to a JSON file")
+    parser.add_argument("--compare", help="a JSON file from an earlier run, "
+                        "slower cases are reported and fail the run")
+    parser.add_argument("--threshold", type=float,
+                        help="the slowdown counted as a regression")
+    args = parser.parse_args()
+
+    benchmark = BarcodeBenchmark(args.lengths, args.batch_size, args.min_time)
+    results = benchmark.run()
+    print(f"{'case':<16}{'length':>8}{'ops/sec':>14}{'peak bytes':>14}")
+    for row in results["results"]:
+        print(f"{row['case']:<16}{row['length']:>8}"
+              f"{row['ops_per_sec']:>14.1f}{row['peak_bytes']:>14}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = benchmark.compare(results, baseline, args.threshold)
+        for row in regressions:
+            print(f"regression: {row['case']} at length {row['length']} runs "
+                  f"at {row['ratio']:.0%} of the baseline rate")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
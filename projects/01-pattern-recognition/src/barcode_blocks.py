@@ -0,0 +1,183 @@
+# Summary: Splits payloads too long for a single InfoBox barcode across a
+# sequence of sub-images, and reassembles them from a batch or a stream.
+from stars_and_stripes import InfoBox
+
+class MultiBlockCodec:
+    """Encodes a long payload as a sequence of InfoBox barcodes (blocks) and
+    decodes a sequence of blocks back into the payload. Every block starts
+    with a header holding its position in the sequence and the number of
+    blocks in the sequence.
+    ...
+    Attributes
+    ----------
+    block_size: int
+        The number of payload characters carried by each block.
+    ----------
+    Misc Variables
+        HEADER_LENGTH: int
+            The number of columns used by the sequence header.
+        FIELD_LENGTH: int
+            The number of columns used by each header field.
+        MAX_BLOCKS: int
+            The largest number of blocks a header can describe.
+        DEFAULT_BLOCK_SIZE: int
+            Payload characters per block, sized so a block fits the original
+            65 column label.
+
+    Methods
+    ----------
+    Mutators
+        encode(text):
+            Encodes the text into a stack of block images and returns it with
+            the width of every block.
+        decode(images):
+            Decodes a batch of block images in one pass and returns the
+            reassembled text.
+    Accessors
+        split_text(text):
+            Splits the text into block strings, header included, and returns
+            them in order.
+        join_blocks(blocks):
+            Reassembles decoded block strings in any order and returns the
+            text.
+    Class Helpers
+        make_header(index, count):
+            Builds the header string for the block at index.
+        read_header(block):
+            Returns the (index, count, payload) stored in a decoded block.
+    """
+    HEADER_LENGTH: int = 4
+    FIELD_LENGTH: int = 2
+    MAX_BLOCKS: int = 256 ** FIELD_LENGTH - 1
+    DEFAULT_BLOCK_SIZE: int = 59
+
+    def __init__(self, block_size = None):
+        self.block_size = block_size or MultiBlockCodec.DEFAULT_BLOCK_SIZE
+
+    # mutators -----------------------------------------------------------
+    def encode(self, text):
+        """Encodes the text into a stack of block images and returns it with
+        the width of every block."""
+        return InfoBox.encode_batch(self.split_text(text))
+
+    def decode(self, images):
+        """Decodes a batch of block images in one pass and returns the
+        reassembled text."""
+        return self.join_blocks(InfoBox.decode_batch(images))
+
+    # accessors ----------------------------------------------------------
+    def split_text(self, text):
+        """Splits the text into block strings, header included, and returns
+        them in order."""
+        # an empty payload still gets one (empty) block so it round trips
+        chunks = [text[start:start + self.block_size]
+                  for start in range(0, len(text), self.block_size)] or [""]
+        if len(chunks) > self.MAX_BLOCKS:
+            raise ValueError(f"payload needs {len(chunks)} blocks, the "
+                             f"header allows at most {self.MAX_BLOCKS}")
+        return [self.make_header(index, len(chunks)) + chunk
+                for index, chunk in enumerate(chunks)]
+
+    def join_blocks(self, blocks):
+        """Reassembles decoded block strings in any order and returns the
+        text."""
+        reassembler = BlockReassembler()
+        text = "".join(reassembler.add_block(block) for block in blocks)
+        if not reassembler.is_complete():
+            raise ValueError("block sequence is incomplete, "
+                             f"{reassembler.get_missing_count()} missing")
+        return text
+
+    # class helpers ------------------------------------------------------
+    @classmethod
+    def make_header(cls, index, count):
+        """Builds the header string for the block at index."""
+        return "".join(chr(byte) for byte in
+                       index.to_bytes(cls.FIELD_LENGTH, "big") +
+                       count.to_bytes(cls.FIELD_LENGTH, "big"))
+
+    @classmethod
+    def read_header(cls, block):
+        """Returns the (index, count, payload) stored in a decoded block."""
+        if len(block) < cls.HEADER_LENGTH:
+            raise ValueError(f"block of length {len(block)} is too short to "
+                             f"hold a {cls.HEADER_LENGTH} column header")
+        header = block[:cls.HEADER_LENGTH].encode("latin-1")
+        index = int.from_bytes(header[:cls.FIELD_LENGTH], "big")
+        count = int.from_bytes(header[cls.FIELD_LENGTH:], "big")
+        if index >= count:
+            raise ValueError(f"block index {index} is outside a sequence of "
+                             f"{count} blocks")
+        return index, count, block[cls.HEADER_LENGTH:]
+
+class BlockReassembler:
+    """Collects decoded blocks as they arrive, in any order, and emits the
+    payload text as soon as the next block in the sequence is available.
+    ...
+    Attributes
+    ----------
+    count: int, None
+        The number of blocks in the sequence, known after the first block.
+    next_index: int
+        The index of the next block to emit.
+    pending: dict
+        Blocks that arrived ahead of next_index, keyed by index.
+
+    Methods
+    ----------
+    Mutators
+        add_block(block):
+            Stores a decoded block and returns the text it made contiguous.
+        add_images(images):
+            Decodes a batch of block images and returns the text they made
+            contiguous.
+    Accessors
+        is_complete():
+            Returns True once every block has been emitted.
+        get_missing_count():
+            Returns the number of blocks not yet emitted, or None before the
+            first block arrives.
+    """
+    def __init__(self):
+        self.count = None
+        self.next_index = 0
+        self.pending = {}
+
+    # mutators -----------------------------------------------------------
+    def add_block(self, block):
+        """Stores a decoded block and returns the text it made contiguous."""
+        index, count, payload = MultiBlockCodec.read_header(block)
+        # the first block fixes the length of the sequence
+        if self.count is None:
+            self.count = count
+        elif count != self.count:
+            raise ValueError(f"block {index} belongs to a sequence of {count} "
+                             f"blocks, expected {self.count}")
+        # ignore repeats of blocks already emitted or waiting
+        if index < self.next_index or index in self.pending:
+            return ""
+        self.pending[index] = payload
+        # emit every block that is now contiguous with what came before
+        ready = []
+        while self.next_index in self.pending:
+            ready.append(self.pending.pop(self.next_index))
+            self.next_index += 1
+        return "".join(ready)
+
+    def add_images(self, images):
+        """Decodes a batch of block images and returns the text they made
+        contiguous."""
+        return "".join(self.add_block(block)
+                       for block in InfoBox.decode_batch(images))
+
+    # accessors ----------------------------------------------------------
+    def is_complete(self):
+        """Returns True once every block has been emitted."""
+        return self.count is not None and self.next_index == self.count
+
+    def get_missing_count(self):
+        """Returns the number of blocks not yet emitted, or None before the
+        first block arrives."""
+        if self.count is None:
+            return None
+        return self.count - self.next_index
@@ -0,0 +1,91 @@
+# Summary: Bounded least-recently-used cache for encode and decode results,
+# with hit, miss and eviction counters.
+from collections import OrderedDict
+
+class BarcodeCache:
+    """Bounded LRU cache placed in front of InfoBox encoding and decoding by
+    assigning it to InfoBox.cache, which every InfoBox shares. Encoded images
+    are keyed by message text and stored as shared read-only images, decoded
+    text is keyed by the hash of the bit-packed image.
+    ...
+    Attributes
+    ----------
+    max_size: int
+        The number of entries kept before the least recently used is evicted.
+    entries: OrderedDict
+        The cached values, least recently used first.
+    hits: int
+        The number of lookups that found an entry.
+    misses: int
+        The number of lookups that found nothing.
+    evictions: int
+        The number of entries dropped to stay within max_size.
+    ----------
+    Misc Variables
+        DEFAULT_MAX_SIZE: int
+            The number of entries kept by default.
+
+    Methods
+    ----------
+    Mutators
+        get(key):
+            Returns the value stored under key and marks it as recently used,
+            or None if there is none.
+        put(key, value):
+            Stores the value under key, evicting the least recently used
+            entry if the cache is full.
+        clear():
+            Drops every entry and resets the counters.
+    Accessors
+        __len__():
+            Returns the number of entries.
+        get_stats():
+            Returns the size and counters of the cache as a dict.
+    """
+    DEFAULT_MAX_SIZE: int = 4096
+
+    def __init__(self, max_size = None):
+        self.max_size = max_size or BarcodeCache.DEFAULT_MAX_SIZE
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # mutators -----------------------------------------------------------
+    def get(self, key):
+        """Returns the value stored under key and marks it as recently used,
+        or None if there is none."""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Stores the value under key, evicting the least recently used
+        entry if the cache is full."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drops every entry and resets the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # accessors ----------------------------------------------------------
+    def __len__(self):
+        """Returns the number of entries."""
+        return len(self.entries)
+
+    def get_stats(self):
+        """Returns the size and counters of the cache as a dict."""
+        return {"size": len(self.entries), "max_size": self.max_size,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
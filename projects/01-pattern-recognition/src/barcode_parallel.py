@@ -0,0 +1,111 @@
+# Summary: Fans large barcode batches out across a process pool. Pixels are
+# shared with the workers through one shared memory block instead of being
+# pickled, and results come back in input order.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from stars_and_stripes import InfoBox
+
+class ParallelDecoder:
+    """Decodes batches of barcode images on a pool of worker processes. The
+    batch is stacked once into shared memory, and every worker decodes its
+    own chunk of the stack in place with InfoBox.decode_batch.
+    ...
+    Attributes
+    ----------
+    workers: int
+        The number of worker processes.
+    chunk_size: int
+        The number of images each worker decodes per task. Batches no larger
+        than one chunk are decoded in the calling process.
+    pool: ProcessPoolExecutor, None
+        The worker pool, started on first use and reused until close().
+    ----------
+    Misc Variables
+        DEFAULT_CHUNK_SIZE: int
+            The number of images per task by default.
+
+    Methods
+    ----------
+    Mutators
+        decode(images):
+            Decodes a batch of images and returns the texts in input order.
+        close():
+            Shuts the worker pool down.
+    Worker Methods
+        decode_shared_chunk(task):
+            Decodes one chunk of a stack held in shared memory and returns
+            the texts.
+    """
+    DEFAULT_CHUNK_SIZE: int = 4096
+
+    def __init__(self, workers = None, chunk_size = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or ParallelDecoder.DEFAULT_CHUNK_SIZE
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # mutators -----------------------------------------------------------
+    def decode(self, images):
+        """Decodes a batch of images and returns the texts in input order."""
+        pixel_arrays = InfoBox.get_pixel_arrays(images)
+        shape = (len(pixel_arrays),
+                 max((pixels.shape[0] for pixels in pixel_arrays), default=0),
+                 max((pixels.shape[1] for pixels in pixel_arrays), default=0))
+        # a single chunk isn't worth the trip to another process
+        if shape[0] <= self.chunk_size or not np.prod(shape):
+            # a stack already in one array is decoded as it is
+            return InfoBox.decode_batch(
+                images if isinstance(images, np.ndarray) else pixel_arrays)
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        shared = shared_memory.SharedMemory(create=True,
+                                            size=int(np.prod(shape)))
+        try:
+            # the images are padded straight into the shared block, the only
+            # copy of the pixel data, and every worker reads from it
+            stack = np.ndarray(shape, dtype=np.uint8, buffer=shared.buf)
+            InfoBox.stack_images(pixel_arrays, out=stack)
+            # release the view before the block is closed
+            del stack
+            tasks = [(shared.name, shape, start,
+                      min(start + self.chunk_size, shape[0]))
+                     for start in range(0, shape[0], self.chunk_size)]
+            texts = []
+            # map hands results back in task order
+            for chunk_texts in self.pool.map(self.decode_shared_chunk, tasks):
+                texts.extend(chunk_texts)
+            return texts
+        finally:
+            shared.close()
+            shared.unlink()
+
+    def close(self):
+        """Shuts the worker pool down."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    # worker methods -----------------------------------------------------
+    @staticmethod
+    def decode_shared_chunk(task):
+        """Decodes one chunk of a stack held in shared memory and returns
+        the texts."""
+        name, shape, start, stop = task
+        shared = shared_memory.SharedMemory(name=name)
+        try:
+            stack = np.ndarray(shape, dtype=np.uint8, buffer=shared.buf)
+            texts = InfoBox.decode_batch(stack[start:stop])
+            # release the view before detaching from the block
+            del stack
+            return texts
+        finally:
+            shared.close()
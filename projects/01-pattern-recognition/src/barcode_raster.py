@@ -0,0 +1,394 @@
+# Summary: Exports barcode pixels as binary PBM or 1-bit PNG raster images,
+# scaled up and surrounded by a quiet zone, straight from the pixel arrays, and
+# imports PBM, PGM and PNG scans back onto the module grid InfoBox decodes.
+import re
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from stars_and_stripes import BarcodeImage, InfoBox
+
+class BarcodeRaster:
+    """Converts barcode pixels into raster image files and back. On export
+    every pixel becomes a scale x scale square module and the barcode is
+    padded with a white quiet zone, all with whole-array operations, and the
+    rows are bit-packed in bulk for writing. On import the scan is
+    thresholded, cropped to the barcode and every module is reduced to one
+    pixel by majority vote, again without per-pixel loops.
+    ...
+    Attributes
+    ----------
+    scale: int
+        The size of one module, in raster pixels.
+    quiet_zone: int
+        The width of the white margin around the barcode, in modules.
+    threshold: float, None
+        The share of full brightness under which an imported pixel counts as
+        black. None picks a threshold for every scan (Otsu's method).
+    ----------
+    Misc Variables
+        DEFAULT_SCALE: int
+            The module size by default.
+        DEFAULT_QUIET_ZONE: int
+            The quiet zone width by default.
+        PBM_MAGIC: bytes
+            Identifies a binary PBM image.
+        PNG_SIGNATURE: bytes
+            Identifies a PNG image.
+        PNG_HEADER_STRUCT: struct.Struct
+            Width, height, bit depth, colour type, compression, filter and
+            interlace of a PNG image.
+        PNG_CHANNELS: dict
+            The number of samples per pixel of every PNG colour type.
+        NETPBM_MAGICS: tuple
+            The plain and binary PBM and PGM magic numbers that can be read.
+        LUMINANCE_WEIGHTS: np.ndarray
+            The weight of the red, green and blue channels in the brightness
+            of a colour pixel.
+        NETPBM_FIELD: re.Pattern
+            One whitespace separated field of a Netpbm header, skipping any
+            comments before it.
+
+    Methods
+    ----------
+    Accessors
+        get_raster(image):
+            Returns the scaled pixels of a BarcodeImage or 2D array, quiet
+            zone included.
+        to_pbm(image):
+            Returns an image as the bytes of a binary PBM file.
+        to_png(image):
+            Returns an image as the bytes of a 1-bit grayscale PNG file.
+    Mutators
+        save(image, path):
+            Writes an image to a .pbm or .png file, chosen by the suffix of
+            the path, and returns the path.
+        save_stack(stack, widths, path_pattern):
+            Writes every image of an (N, H, W) stack, cropped to its width,
+            to path_pattern.format(index) and returns the paths.
+    Import Methods
+        read(source, module_size):
+            Reads a scan from a path or bytes and returns its modules as a
+            BarcodeImage.
+        decode(source, module_size):
+            Reads a scan and returns the decoded text.
+        load_pixels(data):
+            Returns the brightness of every pixel of a PBM, PGM or PNG file
+            and the brightness of white.
+        to_binary(gray, maxval):
+            Thresholds brightness values and returns 1 for black pixels.
+        to_modules(binary, module_size):
+            Crops a binary scan to the barcode and returns one pixel per
+            module.
+    Instance Helpers
+        make_png_chunk(chunk_type, data):
+            Returns a PNG chunk with its length and checksum.
+        load_netpbm(data):
+            Returns the brightness of every pixel of a PBM or PGM file and
+            the brightness of white.
+        load_png(data):
+            Returns the brightness of every pixel of a PNG file and the
+            brightness of white.
+        unfilter_png(raw, pixel_bytes):
+            Undoes the PNG row filters and returns the scanline bytes.
+        get_otsu_threshold(levels):
+            Returns the 8-bit level splitting a scan's histogram into dark
+            and light with the least variance within each.
+        get_module_size(binary):
+            Returns the most common run length along the top border of a
+            binary scan.
+    """
+    DEFAULT_SCALE: int = 4
+    DEFAULT_QUIET_ZONE: int = 2
+    PBM_MAGIC: bytes = b"P4"
+    PNG_SIGNATURE: bytes = b"\x89PNG\r\n\x1a\n"
+    PNG_HEADER_STRUCT = struct.Struct(">IIBBBBB")
+    PNG_CHANNELS: dict = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+    NETPBM_MAGICS: tuple = (b"P1", b"P2", b"P4", b"P5")
+    LUMINANCE_WEIGHTS = np.array([0.299, 0.587, 0.114])
+    NETPBM_FIELD = re.compile(rb"(?:\s|#[^\n]*\n?)*(\S+)")
+
+    def __init__(self, scale = None, quiet_zone = None, threshold = None):
+        self.scale = scale or BarcodeRaster.DEFAULT_SCALE
+        self.quiet_zone = (BarcodeRaster.DEFAULT_QUIET_ZONE
+                           if quiet_zone is None else quiet_zone)
+        self.threshold = threshold
+
+    # accessors ----------------------------------------------------------
+    def get_raster(self, image):
+        """Returns the scaled pixels of a BarcodeImage or 2D array, quiet
+        zone included."""
+        if isinstance(image, BarcodeImage):
+            image = image.image_data
+        # pad with white modules, then blow every module up to scale pixels
+        raster = np.pad(np.asarray(image, dtype=np.uint8), self.quiet_zone)
+        return raster.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+
+    def to_pbm(self, image):
+        """Returns an image as the bytes of a binary PBM file."""
+        raster = self.get_raster(image)
+        height, width = raster.shape
+        # PBM draws 1 as black, like BarcodeImage, so rows pack as they are
+        return (self.PBM_MAGIC + f"\n{width} {height}\n".encode("ascii") +
+                np.packbits(raster, axis=1).tobytes())
+
+    def to_png(self, image):
+        """Returns an image as the bytes of a 1-bit grayscale PNG file."""
+        raster = self.get_raster(image)
+        height, width = raster.shape
+        # PNG grayscale draws 0 as black, and every row starts with its
+        # filter type (0, none)
+        packed = np.packbits(raster ^ 1, axis=1)
+        rows = np.zeros((height, packed.shape[1] + 1), dtype=np.uint8)
+        rows[:, 1:] = packed
+        header = self.PNG_HEADER_STRUCT.pack(width, height, 1, 0, 0, 0, 0)
+        return (self.PNG_SIGNATURE +
+                self.make_png_chunk(b"IHDR", header) +
+                self.make_png_chunk(b"IDAT", zlib.compress(rows.tobytes())) +
+                self.make_png_chunk(b"IEND", b""))
+
+    # mutators -----------------------------------------------------------
+    def save(self, image, path):
+        """Writes an image to a .pbm or .png file, chosen by the suffix of
+        the path, and returns the path."""
+        path = Path(path)
+        if path.suffix.lower() == ".png":
+            data = self.to_png(image)
+        elif path.suffix.lower() == ".pbm":
+            data = self.to_pbm(image)
+        else:
+            raise ValueError(f"can't tell the raster format of {path}, "
+                             "use a .pbm or .png suffix")
+        path.write_bytes(data)
+        return path
+
+    def save_stack(self, stack, widths, path_pattern):
+        """Writes every image of an (N, H, W) stack, cropped to its width,
+        to path_pattern.format(index) and returns the paths."""
+        return [self.save(pixels[:, :width], str(path_pattern).format(index))
+                for index, (pixels, width) in enumerate(zip(stack, widths))]
+
+    # import methods -----------------------------------------------------
+    def read(self, source, module_size = None):
+        """Reads a scan from a path or bytes and returns its modules as a
+        BarcodeImage.
+
+        The module size is measured from the top border unless given."""
+        data = source if isinstance(source, bytes) else Path(source).read_bytes()
+        modules = self.to_modules(self.to_binary(*self.load_pixels(data)),
+                                  module_size)
+        return BarcodeImage.from_array(modules)
+
+    def decode(self, source, module_size = None):
+        """Reads a scan and returns the decoded text."""
+        info_box = InfoBox(self.read(source, module_size))
+        info_box.translate_image_to_text()
+        return info_box.text
+
+    def load_pixels(self, data):
+        """Returns the brightness of every pixel of a PBM, PGM or PNG file
+        and the brightness of white."""
+        if data.startswith(self.PNG_SIGNATURE):
+            return self.load_png(data)
+        if data[:2] in self.NETPBM_MAGICS:
+            return self.load_netpbm(data)
+        raise ValueError("not a PBM, PGM or PNG image")
+
+    def to_binary(self, gray, maxval):
+        """Thresholds brightness values and returns 1 for black pixels."""
+        # bring every bit depth onto the same 8-bit scale
+        levels = (gray.astype(np.uint32) * 255 // maxval).astype(np.uint8)
+        if self.threshold is None:
+            cut = self.get_otsu_threshold(levels)
+        else:
+            cut = self.threshold * 255
+        return (levels < cut).astype(BarcodeImage.PIXEL_DTYPE)
+
+    def to_modules(self, binary, module_size = None):
+        """Crops a binary scan to the barcode and returns one pixel per
+        module."""
+        # isolated specks in the quiet zone don't count, every pixel of the
+        # barcode's borders touches another black pixel
+        black = binary.astype(bool)
+        touching = np.zeros_like(black)
+        touching[:-1] |= black[1:]
+        touching[1:] |= black[:-1]
+        touching[:, :-1] |= black[:, 1:]
+        touching[:, 1:] |= black[:, :-1]
+        black &= touching
+        black_rows = np.flatnonzero(black.any(axis=1))
+        black_cols = np.flatnonzero(black.any(axis=0))
+        if not len(black_rows):
+            return np.zeros((0, 0), dtype=BarcodeImage.PIXEL_DTYPE)
+        # the quiet zone is everything outside the black pixels
+        binary = binary[black_rows[0]:black_rows[-1] + 1,
+                        black_cols[0]:black_cols[-1] + 1]
+        module_size = module_size or self.get_module_size(binary)
+        # round the crop up to whole modules, padding with white
+        height = -(-binary.shape[0] // module_size)
+        width = -(-binary.shape[1] // module_size)
+        binary = np.pad(binary, ((0, height * module_size - binary.shape[0]),
+                                 (0, width * module_size - binary.shape[1])))
+        # give every module the colour of most of its pixels
+        blocks = binary.reshape(height, module_size, width, module_size)
+        votes = blocks.sum(axis=(1, 3), dtype=np.intp)
+        return (2 * votes > module_size * module_size).astype(
+            BarcodeImage.PIXEL_DTYPE)
+
+    # instance helpers ---------------------------------------------------
+    def make_png_chunk(self, chunk_type, data):
+        """Returns a PNG chunk with its length and checksum."""
+        return (struct.pack(">I", len(data)) + chunk_type + data +
+                struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+    def load_netpbm(self, data):
+        """Returns the brightness of every pixel of a PBM or PGM file and
+        the brightness of white."""
+        magic = data[:2]
+        field_count = 3 if magic in (b"P1", b"P4") else 4
+        fields = []
+        offset = 0
+        # magic, width, height and maxval, with comments allowed between
+        for _ in range(field_count):
+            match = self.NETPBM_FIELD.match(data, offset)
+            if match is None:
+                raise ValueError("truncated Netpbm header")
+            fields.append(match.group(1))
+            offset = match.end()
+        width, height = int(fields[1]), int(fields[2])
+        maxval = int(fields[3]) if field_count == 4 else 1
+        # a single whitespace character ends the header
+        raster = data[offset + 1:]
+        if magic == b"P4":
+            # PBM draws 1 as black, brightness is the inverse
+            bits = np.unpackbits(np.frombuffer(raster, dtype=np.uint8)
+                                 .reshape(height, -1), axis=1, count=width)
+            return bits ^ 1, maxval
+        if magic == b"P1":
+            chars = np.frombuffer(raster, dtype=np.uint8)
+            bits = chars[(chars == ord("0")) | (chars == ord("1"))] - ord("0")
+            return bits[:width * height].reshape(height, width) ^ 1, maxval
+        if magic == b"P2":
+            values = np.array(raster.split(), dtype=np.uint32)
+            return values[:width * height].reshape(height, width), maxval
+        dtype = np.uint8 if maxval < 256 else np.dtype(">u2")
+        gray = np.frombuffer(raster, dtype=dtype, count=width * height)
+        return gray.reshape(height, width), maxval
+
+    def load_png(self, data):
+        """Returns the brightness of every pixel of a PNG file and the
+        brightness of white."""
+        offset = len(self.PNG_SIGNATURE)
+        header = palette = None
+        compressed = []
+        while offset < len(data):
+            (length,) = struct.unpack_from(">I", data, offset)
+            chunk_type = data[offset + 4:offset + 8]
+            chunk = data[offset + 8:offset + 8 + length]
+            offset += length + 12
+            if chunk_type == b"IHDR":
+                header = self.PNG_HEADER_STRUCT.unpack(chunk)
+            elif chunk_type == b"PLTE":
+                palette = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, 3)
+            elif chunk_type == b"IDAT":
+                compressed.append(chunk)
+            elif chunk_type == b"IEND":
+                break
+        if header is None:
+            raise ValueError("PNG image has no IHDR chunk")
+        width, height, bit_depth, colour_type, _, _, interlace = header
+        if interlace or colour_type not in self.PNG_CHANNELS:
+            raise ValueError("interlaced and unknown PNG images aren't "
+                             "supported")
+        channels = self.PNG_CHANNELS[colour_type]
+        bits_per_pixel = channels * bit_depth
+        row_bytes = -(-width * bits_per_pixel // 8)
+        raw = np.frombuffer(zlib.decompress(b"".join(compressed)),
+                            dtype=np.uint8).reshape(height, row_bytes + 1)
+        rows = self.unfilter_png(raw, max(1, bits_per_pixel // 8))
+        # split the scanlines into samples of the image's bit depth
+        if bit_depth == 16:
+            samples = rows.view(">u2").reshape(height, -1)
+        elif bit_depth == 8:
+            samples = rows
+        else:
+            bits = np.unpackbits(rows, axis=1).reshape(height, -1, bit_depth)
+            samples = bits @ (1 << np.arange(bit_depth - 1, -1, -1))
+        samples = samples[:, :width * channels].reshape(height, width, channels)
+        maxval = (1 << bit_depth) - 1
+        if colour_type == 3:
+            # look every index up in the palette
+            samples = palette[samples[:, :, 0]]
+            maxval = 255
+        if samples.shape[2] >= 3:
+            # colour pixels, with or without alpha, go by their luminance
+            return samples[:, :, :3] @ self.LUMINANCE_WEIGHTS, maxval
+        # grayscale pixels, with or without alpha
+        return samples[:, :, 0], maxval
+
+    def unfilter_png(self, raw, pixel_bytes):
+        """Undoes the PNG row filters and returns the scanline bytes.
+
+        Every byte depends on the byte one pixel to its left, the byte above
+        it and the byte above that one, so all bytes on one anti-diagonal
+        (row + column // pixel_bytes) are restored together, in
+        height + width steps."""
+        filters = raw[:, 0]
+        # unfiltered rows are the scanlines already
+        if not filters.any():
+            return raw[:, 1:]
+        if filters.max() > 4:
+            raise ValueError("unknown PNG row filter")
+        filtered = raw[:, 1:].astype(np.int32)
+        height, row_bytes = filtered.shape
+        # a zero row above the first and zero pixel left of every row stand
+        # in for the bytes outside the image
+        out = np.zeros((height + 1, row_bytes + pixel_bytes), dtype=np.int32)
+        rows, cols = np.indices((height, row_bytes))
+        steps = (rows + cols // pixel_bytes).ravel()
+        order = np.argsort(steps, kind="stable")
+        bounds = np.searchsorted(steps[order], np.arange(steps.max() + 2))
+        rows, cols = rows.ravel()[order], cols.ravel()[order]
+        for step in range(len(bounds) - 1):
+            row = rows[bounds[step]:bounds[step + 1]]
+            col = cols[bounds[step]:bounds[step + 1]]
+            left = out[row + 1, col]
+            up = out[row, col + pixel_bytes]
+            up_left = out[row, col]
+            estimate = left + up - up_left
+            left_gap = np.abs(estimate - left)
+            up_gap = np.abs(estimate - up)
+            up_left_gap = np.abs(estimate - up_left)
+            paeth = np.where((left_gap <= up_gap) & (left_gap <= up_left_gap),
+                             left, np.where(up_gap <= up_left_gap, up, up_left))
+            # none, sub, up, average and paeth predictors
+            prediction = np.choose(filters[row], [np.zeros_like(left), left,
+                                                  up, (left + up) // 2, paeth])
+            out[row + 1, col + pixel_bytes] = (filtered[row, col] +
+                                               prediction) & 0xFF
+        return out[1:, pixel_bytes:].astype(np.uint8)
+
+    def get_otsu_threshold(self, levels):
+        """Returns the 8-bit level splitting a scan's histogram into dark
+        and light with the least variance within each."""
+        histogram = np.bincount(levels.ravel(), minlength=256).astype(float)
+        dark_count = np.cumsum(histogram)
+        light_count = dark_count[-1] - dark_count
+        dark_total = np.cumsum(histogram * np.arange(256))
+        light_total = dark_total[-1] - dark_total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread = dark_count * light_count * (
+                dark_total / dark_count - light_total / light_count) ** 2
+        # levels up to the best split are dark
+        return int(np.nan_to_num(spread).argmax()) + 1
+
+    def get_module_size(self, binary):
+        """Returns the most common run length along the top border of a
+        binary scan."""
+        # the alternating top border is one module per run
+        top_row = binary[0].astype(np.int8)
+        edges = np.flatnonzero(np.diff(top_row))
+        runs = np.diff(np.concatenate([[-1], edges, [len(top_row) - 1]]))
+        return int(np.bincount(runs).argmax())
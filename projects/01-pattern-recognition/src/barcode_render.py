@@ -0,0 +1,102 @@
+# Summary: Renders large numbers of barcodes as text straight into a text
+# stream, such as a log file, one chunk of images per write.
+import sys
+
+import numpy as np
+
+from stars_and_stripes import BarcodeImage, InfoBox
+
+class BarcodeRenderer:
+    """Writes barcode images to a text stream as '*'/space art, or as
+    compact half-block characters. Images are rendered a chunk at a time with
+    InfoBox.render_stack, and every chunk goes out in a single write, so only
+    one chunk of text is held in memory.
+    ...
+    Attributes
+    ----------
+    stream: io.TextIOBase
+        The stream the rendered images are written to.
+    chunk_size: int
+        The number of images rendered and written together.
+    blocks: bool
+        Whether to draw two pixel rows per line with half-block characters.
+    frame: bool
+        Whether to draw the display frame around every image.
+    ----------
+    Misc Variables
+        DEFAULT_CHUNK_SIZE: int
+            The number of images rendered together by default.
+
+    Methods
+    ----------
+    Mutators
+        write_stack(stack, widths):
+            Writes every image of an (N, H, W) stack and returns the number
+            written.
+        write_images(images):
+            Writes a sequence of BarcodeImages, 2D pixel arrays or string
+            lists and returns the number written.
+        write_messages(messages, parity):
+            Encodes and writes every message and returns the number written.
+    Instance Helpers
+        get_widths(images):
+            Returns the width of every image as it was passed in.
+    """
+    DEFAULT_CHUNK_SIZE: int = 1024
+
+    def __init__(self, stream = None, chunk_size = None, blocks = False,
+                 frame = True):
+        self.stream = stream or sys.stdout
+        self.chunk_size = chunk_size or BarcodeRenderer.DEFAULT_CHUNK_SIZE
+        self.blocks = blocks
+        self.frame = frame
+
+    # mutators -----------------------------------------------------------
+    def write_stack(self, stack, widths):
+        """Writes every image of an (N, H, W) stack and returns the number
+        written."""
+        for start in range(0, len(stack), self.chunk_size):
+            stop = start + self.chunk_size
+            texts = InfoBox.render_stack(stack[start:stop], widths[start:stop],
+                                         self.blocks, self.frame)
+            # a blank line after every image, as print() leaves it
+            self.stream.write("\n".join(texts) + "\n")
+        return len(stack)
+
+    def write_images(self, images):
+        """Writes a sequence of BarcodeImages, 2D pixel arrays or string
+        lists and returns the number written."""
+        count = 0
+        for start in range(0, len(images), self.chunk_size):
+            chunk = images[start:start + self.chunk_size]
+            # every image is drawn as wide as it was passed in, whatever
+            # white rows or smudges its borders have
+            count += self.write_stack(InfoBox.stack_images(chunk),
+                                      self.get_widths(chunk))
+        return count
+
+    def write_messages(self, messages, parity = False):
+        """Encodes and writes every message and returns the number
+        written."""
+        count = 0
+        for start in range(0, len(messages), self.chunk_size):
+            stack, widths = InfoBox.encode_batch(
+                messages[start:start + self.chunk_size], parity=parity)
+            count += self.write_stack(stack, widths)
+        return count
+
+    # instance helpers ---------------------------------------------------
+    def get_widths(self, images):
+        """Returns the width of every image as it was passed in."""
+        if isinstance(images, np.ndarray) and images.ndim == 3:
+            return [images.shape[2]] * len(images)
+        widths = []
+        for image in images:
+            if isinstance(image, BarcodeImage):
+                widths.append(image.get_width())
+            elif isinstance(image, np.ndarray):
+                widths.append(image.shape[1])
+            else:
+                # string rows are as wide as the longest of them
+                widths.append(max(map(len, image), default=0))
+        return widths
@@ -0,0 +1,124 @@
+# Summary: Finds every barcode on a large scanned canvas from the closed
+# limitation lines that meet at each barcode's bottom-left corner, then decodes
+# them all in one batch.
+import numpy as np
+
+from stars_and_stripes import BarcodeImage, InfoBox
+
+class BarcodeScanner:
+    """Detects barcode regions in a 2D binary canvas holding any number of
+    barcodes, separated by at least one white row or column.
+
+    Two run-length maps, each built in one linear pass over the canvas, give
+    the length of the vertical black run ending at every pixel and of the
+    horizontal black run starting at every pixel. A bottom-left corner is
+    where a spine of a barcode's height ends on a closed limitation line with
+    nothing black to its left. Every corner is then confirmed against its
+    alternating top border.
+    ...
+    Attributes
+    ----------
+    heights: tuple
+        The barcode heights, borders included, to look for.
+    ----------
+    Misc Variables
+        MIN_BORDER_MATCH: float
+            The share of top border pixels that must follow the alternating
+            pattern, leaving room for smudges.
+
+    Methods
+    ----------
+    Accessors
+        find_regions(canvas):
+            Returns the (top, left, height, width) of every barcode on the
+            canvas in reading order.
+        crop_regions(canvas, regions):
+            Returns the pixels of every region as a list of 2D arrays.
+        decode(canvas, confidence):
+            Decodes every barcode on the canvas and returns the texts in
+            reading order, plus their confidences if asked.
+    Instance Helpers
+        get_pixels(canvas):
+            Returns the pixel array of a BarcodeImage or 2D array.
+        runs_down(pixels):
+            Returns the length of the vertical black run ending at every
+            pixel.
+        runs_right(pixels):
+            Returns the length of the horizontal black run starting at every
+            pixel.
+    """
+    MIN_BORDER_MATCH: float = 0.75
+
+    def __init__(self, heights = None):
+        # plain and parity barcodes of every column depth by default
+        self.heights = tuple(heights or (
+            char_bits + 2 + parity_rows
+            for char_bits in InfoBox.CHAR_ENCODINGS
+            for parity_rows in (0, InfoBox.PARITY_ROWS)))
+
+    # accessors ----------------------------------------------------------
+    def find_regions(self, canvas):
+        """Returns the (top, left, height, width) of every barcode on the
+        canvas in reading order."""
+        pixels = self.get_pixels(canvas)
+        if not pixels.size:
+            return []
+        black = pixels != 0
+        spine_runs = self.runs_down(black)
+        bottom_runs = self.runs_right(black)
+        # a spine ends where the pixel below it is white
+        ends_below = np.ones_like(black)
+        ends_below[:-1] = ~black[1:]
+        # and the closed limitation line starts where the pixel left of it
+        # is white
+        starts_left = np.ones_like(black)
+        starts_left[:, 1:] = ~black[:, :-1]
+        corners = (np.isin(spine_runs, self.heights) & ends_below &
+                   starts_left & (bottom_runs >= 2))
+        regions = []
+        for bottom, left in zip(*np.nonzero(corners)):
+            height = int(spine_runs[bottom, left])
+            top = bottom - height + 1
+            box = black[top:bottom + 1, left:]
+            # the top border has to agree with the closed limitation line
+            width = InfoBox.measure_width(box)
+            pattern = np.arange(width) % 2 == 0
+            if (width < 2 or np.mean(box[0, :width] == pattern) <
+                    self.MIN_BORDER_MATCH):
+                continue
+            regions.append((int(top), int(left), height, width))
+        regions.sort()
+        return regions
+
+    def crop_regions(self, canvas, regions):
+        """Returns the pixels of every region as a list of 2D arrays."""
+        pixels = self.get_pixels(canvas)
+        return [pixels[top:top + height, left:left + width]
+                for top, left, height, width in regions]
+
+    def decode(self, canvas, confidence = False):
+        """Decodes every barcode on the canvas and returns the texts in
+        reading order, plus their confidences if asked."""
+        crops = self.crop_regions(canvas, self.find_regions(canvas))
+        return InfoBox.decode_batch(crops, confidence=confidence)
+
+    # instance helpers ---------------------------------------------------
+    def get_pixels(self, canvas):
+        """Returns the pixel array of a BarcodeImage or 2D array."""
+        if isinstance(canvas, BarcodeImage):
+            return canvas.image_data
+        return np.asarray(canvas)
+
+    def runs_down(self, pixels):
+        """Returns the length of the vertical black run ending at every
+        pixel."""
+        rows = np.arange(len(pixels), dtype=np.int32)[:, np.newaxis]
+        # carry the index of the last white row down every column
+        last_white = np.maximum.accumulate(np.where(pixels, -1, rows), axis=0)
+        return rows - last_white
+
+    def runs_right(self, pixels):
+        """Returns the length of the horizontal black run starting at every
+        pixel."""
+        # a run starting at a pixel ends at it when the columns are reversed
+        return self.runs_down(pixels[:, ::-1].T).T[:, ::-1]
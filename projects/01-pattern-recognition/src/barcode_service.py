@@ -0,0 +1,344 @@
+# Summary: An asyncio decode service for scanner stations. Barcode frames
+# arrive over a Unix or TCP socket, frames arriving within a short window are
+# decoded together in one batch, and every text is sent back as soon as its
+# batch is done.
+import argparse
+import asyncio
+import struct
+
+import numpy as np
+
+from barcode_parallel import ParallelDecoder
+from stars_and_stripes import BarcodeImage, InfoBox
+
+class BarcodeDecodeServer:
+    """Serves InfoBox decoding over a stream socket, so clients pay for one
+    long-running interpreter instead of one per label.
+
+    Every request frame is a REQUEST_HEADER (request id, frame kind, width,
+    payload length) followed by the payload: '*'/space rows separated by
+    newlines for ASCII frames, or rows packed eight pixels per byte for
+    packed frames. Every response frame is a RESPONSE_HEADER (request id,
+    status, payload length) followed by the UTF-8 text, or by the error
+    message when the status is STATUS_ERROR. Responses follow the order
+    batches finish in, so clients match them up by request id.
+    ...
+    Attributes
+    ----------
+    window: float
+        The seconds a batch waits for more frames after its first one.
+    max_batch: int
+        The most frames collected into one batch.
+    max_queue: int
+        The most frames waiting for a batch. Clients wait to be read from
+        while the queue is full.
+    decoder: ParallelDecoder, None
+        The process pool batches are decoded on. None decodes every batch
+        with one InfoBox.decode_batch call on a worker thread.
+    queue: asyncio.Queue, None
+        The frames waiting for a batch, with the futures their texts go to.
+    batcher: asyncio.Task, None
+        The task collecting and decoding batches, started by start().
+    ----------
+    Misc Variables
+        REQUEST_HEADER: struct.Struct
+            Request id, frame kind, image width (packed frames only) and
+            payload length, in network byte order.
+        RESPONSE_HEADER: struct.Struct
+            Request id, status and payload length, in network byte order.
+        FRAME_ASCII: int
+            The frame kind of '*'/space rows.
+        FRAME_PACKED: int
+            The frame kind of rows packed eight pixels per byte.
+        STATUS_OK: int
+            The status of a decoded text.
+        STATUS_ERROR: int
+            The status of a frame that could not be decoded.
+        MAX_PAYLOAD: int
+            The largest payload accepted, the largest image with a newline
+            after every row.
+        DEFAULT_WINDOW: float
+            The batching window by default.
+        DEFAULT_MAX_BATCH: int
+            The largest batch by default.
+        DEFAULT_MAX_QUEUE: int
+            The most frames waiting for a batch by default.
+
+    Methods
+    ----------
+    Mutators
+        start(address):
+            Starts listening on a Unix socket path or a (host, port) pair
+            and returns the asyncio server.
+        close():
+            Stops the batcher and shuts the decoder down.
+        handle_client(reader, writer):
+            Reads frames from one connection until it closes, queueing
+            every image for the next batch.
+        run_batches():
+            Collects frames into batches and decodes them, one batch at a
+            time.
+    Accessors
+        decode_images(pixels):
+            Decodes a batch of pixel arrays and returns the texts, or the
+            error of every image that failed.
+        group_frames(pixels):
+            Returns the indices of the frames that can share one stack
+            without padding any of them much, in groups.
+    Instance Helpers
+        parse_frame(kind, width, payload):
+            Returns the BarcodeImage a request payload holds.
+        check_bounds(height, width):
+            Raises a ValueError unless an image of this size fits the image
+            bounds, and returns a boolean.
+        write_response(writer, request_id, future):
+            Sends the outcome of one request back to its client.
+        pack_request(request_id, image, packed):
+            Returns the request frame of a BarcodeImage as bytes.
+        read_response(reader):
+            Reads one response frame and returns its request id, status
+            and text.
+    """
+    REQUEST_HEADER = struct.Struct("!IBHI")
+    RESPONSE_HEADER = struct.Struct("!IBI")
+    FRAME_ASCII: int = 0
+    FRAME_PACKED: int = 1
+    STATUS_OK: int = 0
+    STATUS_ERROR: int = 1
+    MAX_PAYLOAD: int = (BarcodeImage.MAX_WIDTH + 2) * BarcodeImage.MAX_HEIGHT
+    DEFAULT_WINDOW: float = 0.005
+    DEFAULT_MAX_BATCH: int = 1024
+    DEFAULT_MAX_QUEUE: int = 4096
+
+    def __init__(self, window = None, max_batch = None, decoder = None,
+                 max_queue = None):
+        self.window = (BarcodeDecodeServer.DEFAULT_WINDOW if window is None
+                       else window)
+        self.max_batch = max_batch or BarcodeDecodeServer.DEFAULT_MAX_BATCH
+        self.max_queue = max_queue or BarcodeDecodeServer.DEFAULT_MAX_QUEUE
+        self.decoder = decoder
+        self.queue = None
+        self.batcher = None
+
+    # mutators -----------------------------------------------------------
+    async def start(self, address):
+        """Starts listening on a Unix socket path or a (host, port) pair
+        and returns the asyncio server."""
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self.batcher = asyncio.create_task(self.run_batches())
+        if isinstance(address, str):
+            return await asyncio.start_unix_server(self.handle_client,
+                                                   path=address)
+        host, port = address
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def close(self):
+        """Stops the batcher and shuts the decoder down."""
+        if self.batcher is not None:
+            self.batcher.cancel()
+            try:
+                await self.batcher
+            except asyncio.CancelledError:
+                pass
+            self.batcher = None
+        if self.decoder is not None:
+            self.decoder.close()
+
+    async def handle_client(self, reader, writer):
+        """Reads frames from one connection until it closes, queueing
+        every image for the next batch."""
+        loop = asyncio.get_running_loop()
+        pending = set()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(
+                        self.REQUEST_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                request_id, kind, width, length = (
+                    self.REQUEST_HEADER.unpack(header))
+                future = loop.create_future()
+                pending.add(future)
+                future.add_done_callback(pending.discard)
+                future.add_done_callback(
+                    lambda done, request_id=request_id: self.write_response(
+                        writer, request_id, done))
+                # a frame that big can't be skipped safely, so give up on
+                # the connection after saying why
+                if length > self.MAX_PAYLOAD:
+                    future.set_exception(ValueError(
+                        f"a payload of {length} bytes is over the "
+                        f"{self.MAX_PAYLOAD} byte limit"))
+                    break
+                payload = await reader.readexactly(length)
+                try:
+                    image = self.parse_frame(kind, width, payload)
+                except ValueError as error:
+                    future.set_exception(error)
+                    continue
+                await self.queue.put((image.image_data, future))
+                # let slow clients push back on the responses
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # answer everything already sent before hanging up
+            await asyncio.gather(*pending, return_exceptions=True)
+            writer.close()
+
+    async def run_batches(self):
+        """Collects frames into batches and decodes them, one batch at a
+        time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # give the frames of a burst time to join the first one
+            if self.queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            pixels = [item[0] for item in batch]
+            # frames keep queueing up for the next batch meanwhile
+            results = await loop.run_in_executor(None, self.decode_images,
+                                                 pixels)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    # accessors ----------------------------------------------------------
+    def decode_images(self, pixels):
+        """Decodes a batch of pixel arrays and returns the texts, or the
+        error of every image that failed."""
+        decode = (InfoBox.decode_batch if self.decoder is None
+                  else self.decoder.decode)
+        results = [None] * len(pixels)
+        for group in self.group_frames(pixels):
+            try:
+                texts = decode([pixels[index] for index in group])
+            except Exception:
+                # one bad frame shouldn't fail the rest of its group
+                texts = []
+                for index in group:
+                    try:
+                        texts.extend(InfoBox.decode_batch([pixels[index]]))
+                    except Exception as error:
+                        texts.append(error)
+            for index, text in zip(group, texts):
+                results[index] = text
+        return results
+
+    def group_frames(self, pixels):
+        """Returns the indices of the frames that can share one stack
+        without padding any of them much, in groups."""
+        # stacking pads every frame to the tallest and widest in its stack,
+        # so only frames of one height and within twice each other's width
+        # share one, and one huge frame can't blow up everyone's batch
+        groups = {}
+        for index, image in enumerate(pixels):
+            height, width = image.shape
+            groups.setdefault((height, width.bit_length()), []).append(index)
+        return list(groups.values())
+
+    # instance helpers ---------------------------------------------------
+    def parse_frame(self, kind, width, payload):
+        """Returns the BarcodeImage a request payload holds."""
+        if kind == self.FRAME_ASCII:
+            # ragged rows are padded to the longest, so size the rows up
+            # before parsing, with room for a line ending and a '\r'
+            chars = np.frombuffer(payload, dtype=np.uint8)
+            ends = np.append(np.flatnonzero(chars == ord("\n")), len(chars))
+            longest = int(np.diff(ends, prepend=-1).max())
+            self.check_bounds(len(ends) - 1, max(longest - 2, 0))
+            image = BarcodeImage.from_ascii(payload)
+            self.check_bounds(image.get_height(), image.get_width())
+            return image
+        if kind == self.FRAME_PACKED:
+            row_bytes = (width + 7) // 8
+            if not row_bytes or len(payload) % row_bytes:
+                raise ValueError(f"a payload of {len(payload)} bytes doesn't "
+                                 f"split into rows of width {width}")
+            self.check_bounds(len(payload) // row_bytes, width)
+            packed = np.frombuffer(payload, dtype=np.uint8)
+            return BarcodeImage.from_packed(packed.reshape(-1, row_bytes),
+                                            width)
+        raise ValueError(f"unknown frame kind {kind}")
+
+    def check_bounds(self, height, width):
+        """Raises a ValueError unless an image of this size fits the image
+        bounds, and returns a boolean."""
+        if height > BarcodeImage.MAX_HEIGHT or width > BarcodeImage.MAX_WIDTH:
+            raise ValueError(f"a {height}x{width} frame is over the "
+                             f"{BarcodeImage.MAX_HEIGHT}x"
+                             f"{BarcodeImage.MAX_WIDTH} image bounds")
+        return True
+
+    def write_response(self, writer, request_id, future):
+        """Sends the outcome of one request back to its client."""
+        if writer.is_closing() or future.cancelled():
+            return
+        if future.exception() is None:
+            status, payload = self.STATUS_OK, future.result()
+        else:
+            status, payload = self.STATUS_ERROR, str(future.exception())
+        payload = payload.encode("utf-8", "surrogatepass")
+        writer.write(self.RESPONSE_HEADER.pack(request_id, status,
+                                               len(payload)) + payload)
+
+    @classmethod
+    def pack_request(cls, request_id, image, packed = False):
+        """Returns the request frame of a BarcodeImage as bytes."""
+        if packed:
+            kind, width = cls.FRAME_PACKED, image.get_width()
+            payload = image.get_packed_data().tobytes()
+        else:
+            kind, width = cls.FRAME_ASCII, 0
+            chars = InfoBox.PIXEL_CHARS.astype(np.uint8)[image.image_data]
+            payload = b"\n".join(row.tobytes() for row in chars)
+        return cls.REQUEST_HEADER.pack(request_id, kind, width,
+                                       len(payload)) + payload
+
+    @classmethod
+    async def read_response(cls, reader):
+        """Reads one response frame and returns its request id, status
+        and text."""
+        header = await reader.readexactly(cls.RESPONSE_HEADER.size)
+        request_id, status, length = cls.RESPONSE_HEADER.unpack(header)
+        payload = await reader.readexactly(length)
+        return request_id, status, payload.decode("utf-8", "surrogatepass")
+
+async def serve(address, window, processes):
+    decoder = ParallelDecoder(processes) if processes else None
+    service = BarcodeDecodeServer(window, decoder=decoder)
+    server = await service.start(address)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decode barcode frames sent over a socket.")
+    parser.add_argument("--unix", help="listen on this Unix socket path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window", type=float,
+                        default=BarcodeDecodeServer.DEFAULT_WINDOW * 1000,
+                        help="batching window in milliseconds")
+    parser.add_argument("--processes", type=int,
+                        help="decode large batches on this many processes")
+    args = parser.parse_args()
+
+    address = args.unix or (args.host, args.port)
+    try:
+        asyncio.run(serve(address, args.window / 1000, args.processes))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
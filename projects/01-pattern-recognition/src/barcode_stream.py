@@ -0,0 +1,186 @@
+# Summary: Reads a text dump of consecutive ASCII-art barcodes one line at a
+# time and yields the decoded text of every barcode found in it.
+import os
+import sys
+from collections import deque
+
+from stars_and_stripes import InfoBox
+
+class BarcodeStreamReader:
+    """Generator-based reader over a text stream of '*'/space barcodes, such
+    as the output of InfoBox.display_image_to_console. Barcodes are found by
+    their alternating top border, an unbroken spine and a closed limitation
+    line at the bottom. Anything else between barcodes is skipped. Only one
+    batch of barcodes is held in memory at a time.
+    ...
+    Attributes
+    ----------
+    source: str, os.PathLike, iterable
+        A path to the dump, or any iterable of lines such as an open file.
+    batch_size: int
+        The number of barcodes decoded together in one batch.
+    heights: tuple
+        The barcode heights, borders included, to look for. Every layout
+        by default.
+    ----------
+    Misc Variables
+        BLACK_CHAR: str
+            The character marking a black pixel.
+        FRAME_CHAR: str
+            The side border drawn around images by display_image_to_console.
+        DEFAULT_BATCH_SIZE: int
+            The number of barcodes decoded together by default.
+
+    Methods
+    ----------
+    Generators
+        __iter__():
+            Yields the decoded text of every barcode in the stream.
+        iter_images():
+            Yields the lines of every barcode in the stream.
+        iter_lines():
+            Yields every line of the source with line endings and display
+            frames removed.
+        take_images(window, final):
+            Yields and removes every complete barcode at the start of the
+            window.
+    Instance Helpers
+        strip_frame(line):
+            Removes the line ending and any display frame from the line.
+        is_top_border(line):
+            Checks if the line is an alternating top border and returns a
+            boolean.
+        is_barcode(lines):
+            Checks if the lines starting at a top border form a complete
+            barcode and returns a boolean.
+        get_height(lines, final):
+            Returns the height of the barcode the lines start with, or None
+            if there is none or more lines are needed to tell.
+    """
+    BLACK_CHAR: str = "*"
+    FRAME_CHAR: str = "|"
+    DEFAULT_BATCH_SIZE: int = 1024
+
+    def __init__(self, source, batch_size = None, heights = None):
+        self.source = source
+        self.batch_size = batch_size or BarcodeStreamReader.DEFAULT_BATCH_SIZE
+        # plain and parity barcodes of every column depth by default
+        self.heights = tuple(sorted(heights or (
+            char_bits + 2 + parity_rows
+            for char_bits in InfoBox.CHAR_ENCODINGS
+            for parity_rows in (0, InfoBox.PARITY_ROWS))))
+
+    # generators ---------------------------------------------------------
+    def __iter__(self):
+        """Yields the decoded text of every barcode in the stream."""
+        batch = []
+        for lines in self.iter_images():
+            batch.append(lines)
+            # decode a full batch in one vectorized pass, then drop it
+            if len(batch) == self.batch_size:
+                yield from InfoBox.decode_batch(batch)
+                batch = []
+        if batch:
+            yield from InfoBox.decode_batch(batch)
+
+    def iter_images(self):
+        """Yields the lines of every barcode in the stream."""
+        # never hold more than the tallest barcode and the line after it
+        window = deque(maxlen=max(self.heights) + 1)
+        for line in self.iter_lines():
+            window.append(line)
+            yield from self.take_images(window, final=False)
+        yield from self.take_images(window, final=True)
+
+    def iter_lines(self):
+        """Yields every line of the source with line endings and display
+        frames removed."""
+        if isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, encoding="ascii", errors="replace") as file:
+                yield from map(self.strip_frame, file)
+        else:
+            yield from map(self.strip_frame, self.source)
+
+    def take_images(self, window, final):
+        """Yields and removes every complete barcode at the start of the
+        window."""
+        while True:
+            # skip ahead until the window starts on a top border
+            while window and not self.is_top_border(window[0]):
+                window.popleft()
+            if not window:
+                return
+            lines = list(window)
+            height = self.get_height(lines, final)
+            if height is not None:
+                yield lines[:height]
+                for _ in range(height):
+                    window.popleft()
+            elif final or len(lines) == window.maxlen:
+                # a false start, resume the search after its top border
+                window.popleft()
+            else:
+                # wait for the lines that tell
+                return
+
+    # instance helpers ---------------------------------------------------
+    def strip_frame(self, line):
+        """Removes the line ending and any display frame from the line."""
+        line = line.rstrip("\r\n")
+        if line.startswith(self.FRAME_CHAR) and line.endswith(self.FRAME_CHAR):
+            line = line[1:-1]
+        return line
+
+    def is_top_border(self, line):
+        """Checks if the line is an alternating top border and returns a
+        boolean."""
+        border = line.rstrip()
+        # black on every even column, white on every odd column
+        return (len(border) % 2 == 1 and
+                border[::2] == self.BLACK_CHAR * (len(border) // 2 + 1) and
+                not border[1::2].strip())
+
+    def is_barcode(self, lines):
+        """Checks if the lines starting at a top border form a complete
+        barcode and returns a boolean."""
+        rows = [line.rstrip() for line in lines]
+        width = len(rows[-1])
+        # the closed limitation line spans the full width, which the top
+        # border reaches or stops one column short of (even widths)
+        if (width < 2 or rows[-1] != self.BLACK_CHAR * width or
+                width - len(rows[0]) not in (0, 1)):
+            return False
+        for row_index, row in enumerate(rows[1:-1], start=1):
+            # the spine runs unbroken from top to bottom and nothing spills
+            # past the right border
+            if not row.startswith(self.BLACK_CHAR) or len(row) > width:
+                return False
+            # the open right border is black on every other row
+            if row_index % 2 and len(row) != width:
+                return False
+        return True
+
+    def get_height(self, lines, final):
+        """Returns the height of the barcode the lines start with, or None
+        if there is none or more lines are needed to tell."""
+        for height in self.heights:
+            if len(lines) < height or not self.is_barcode(lines[:height]):
+                continue
+            # the spine has to end with the closed limitation line, so a
+            # shorter layout doesn't cut a taller barcode short
+            if len(lines) == height:
+                return height if final else None
+            after = lines[height]
+            if (not after.startswith(self.BLACK_CHAR) or
+                    self.is_top_border(after)):
+                return height
+        return None
+
+def main():
+    # decode every barcode in the dumps named on the command line
+    for path in sys.argv[1:]:
+        for text in BarcodeStreamReader(path):
+            print(text)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
+import hashlib
 import numpy as np
-import copy
 from abc import ABC, abstractmethod
 
 class BarcodeABC(ABC):
@@ -38,6 +38,10 @@ class BarcodeABC(ABC):
             Display the image to the console.
 
     """
+    # implementing classes hold bc and text in slots or properties of
+    # their own
+    __slots__ = ()
+
     def __init__(self, bc, text):
         self.bc = bc
         self.text = text
@@ -89,105 +93,255 @@ class BarcodeImage:
     Attributes
     ----------
     General
-        data: str, BarcodeImage
-            Used to store the data to be encoded into an image or text input.
-        image_data: 2D List
-            A 2D list of integers representing binary image data.
-        active_row: int
-            The current row of the image being processed.
-        active_col: int
-            The current column of the image being processed.
+        image_data: 2D np.ndarray
+            A uint8 array sized to the image content, holding one 0/1 pixel
+            per cell. Rows and columns can be sliced as views without copying.
+            The array is read-only while its pixels are shared with a view,
+            and is copied on the first set_pixel call.
+        max_width: int
+            The widest image this instance accepts.
+        max_height: int
+            The tallest image this instance accepts.
     Misc Variables
         MAX_WIDTH: int
-            The maximum width of the image.
+            The default maximum width of an image.
         MAX_HEIGHT: int
-            The maximum height of the image.
+            The default maximum height of an image.
         BLACK_CHAR_BINARY: int
             The binary value of a black pixel.
         WHITE_CHAR_BINARY: int
             The binary value of a white pixel.
+        BLACK_CHAR_ORD: int
+            The byte value of the asterisk marking a black pixel in string
+            input.
+        PIXEL_DTYPE: np.dtype
+            The NumPy dtype used for the pixel array.
+        ASCII_TABLE: bytes
+            A bytes.translate table turning the asterisk into 1 and every
+            other byte into 0.
 
     Methods
     ----------
+    Constructors
+        blank(height, width):
+            Creates an all-white image of the specified size.
+        from_packed(packed, width):
+            Creates an image from rows packed eight pixels per byte.
+        from_array(pixels):
+            Creates an image wrapping a 2D array of 0/1 pixels without
+            copying it.
+        from_buffer(buffer, width):
+            Creates an image wrapping a buffer of 0/1 bytes, one per pixel,
+            without copying it.
+        from_ascii(data):
+            Creates an image from '*'/space rows held in one string or
+            buffer.
     Mutators
         set_pixel(row, col, value):
             Sets the value of the pixel at the specified row and column to the
-            specified value.
+            specified value. Shared pixels are copied before the first write.
     Accessors
         get_pixel(row, col):
             Returns the value of the pixel at the specified row and column.
+        get_height():
+            Returns the number of rows in the image.
+        get_width():
+            Returns the number of columns in the image.
+        get_row(row):
+            Returns a view of the pixels in the specified row.
+        get_col(col):
+            Returns a view of the pixels in the specified column.
+        get_packed_data():
+            Returns the image packed eight pixels per byte along each row.
+        get_hash():
+            Returns a digest of the size and bit-packed pixels of the image.
+        get_view():
+            Returns an image sharing these pixels without copying them.
+        copy():
+            Returns an image with its own copy of these pixels.
+        is_shared():
+            Checks if the pixels are shared with a view and returns a boolean.
     Instance Helpers
         check_size(data):
             Checks the size of the data to be encoded and returns a boolean.
+        parse_lines(data):
+            Converts string rows into a 2D array of 0/1 pixels.
+        parse_ascii(raw):
+            Converts '*'/space rows separated by newlines in a bytes object
+            into a 2D array of 0/1 pixels.
     """
-    MAX_WIDTH = 65
-    MAX_HEIGHT = 30
+    MAX_WIDTH = 16384
+    MAX_HEIGHT = 1024
     BLACK_CHAR_BINARY: int = 1
     WHITE_CHAR_BINARY: int = 0
+    BLACK_CHAR_ORD: int = ord("*")
+    PIXEL_DTYPE = np.uint8
+    ASCII_TABLE: bytes = bytes(BLACK_CHAR_ORD) + b"\x01" + bytes(
+        255 - BLACK_CHAR_ORD)
+    # the pixels and bounds are all an image holds, the input strings are
+    # parsed and dropped
+    __slots__ = ("image_data", "max_width", "max_height")
 
-    def __init__(self, str_data = None):
-        self.data = str_data
+    def __init__(self, str_data = None, max_width = None, max_height = None):
+        # set the upper bounds to the input/default values
+        self.max_width = max_width or BarcodeImage.MAX_WIDTH
+        self.max_height = max_height or BarcodeImage.MAX_HEIGHT
+        # initialize an empty pixel array until the content size is known
+        self.image_data = np.zeros((0, 0), dtype=self.PIXEL_DTYPE)
         # check if the data is a sub-instance of the class
-        if isinstance(self.data, BarcodeImage):
-            # if so, extract the data attribute so we can grab the list
-            self.data = str_data.data
-
-        # initialize 2D List
-        self.image_data = [[0 for row in range(BarcodeImage.MAX_WIDTH)]
-        for col in range(BarcodeImage.MAX_HEIGHT)]
-        # setting max column width
-        self.image_data_col = BarcodeImage.MAX_WIDTH
-        # tracking active row for the loop starting from the bottom
-        self.active_row = BarcodeImage.MAX_HEIGHT - 1
-        # tracking active column for the loop starting from the left
-        self.active_col = 0
+        if isinstance(str_data, BarcodeImage):
+            # if so, copy its pixels directly instead of re-parsing strings
+            self.image_data = str_data.image_data.copy()
         # check if the size of the data is within valid image_data bounds
-        if self.check_size(self.data):
-            # traverse each line in the image going from bottom to top row
-            for line_index in range(len(self.data) - 1, -1, -1):
-                # traverse each character in the line going from left to right
-                for char_index in range(len(self.data[line_index])):
-                    # if the character is a black marking
-                    if self.data[line_index][char_index] == "*":
-                        # set the pixel to 1 in the binary image_data array
-                        self.set_pixel(self.active_row,
-                                       self.active_col,
-                                       self.BLACK_CHAR_BINARY)
-                    # advance to the next column
-                    self.active_col += 1
-                # after exhausting characters in the string: advance to the
-                # next row/item (descending) in the list and reset col
-                self.active_row -= 1
-                self.active_col = 0
+        elif str_data is not None and self.check_size(str_data):
+            # size the image to the parsed rows
+            self.image_data = self.parse_lines(str_data)
+
+    # constructors -------------------------------------------------------
+    @classmethod
+    def blank(cls, height, width):
+        """Creates an all-white image of the specified size."""
+        image = cls(max_width=width, max_height=height)
+        image.image_data = np.zeros((height, width), dtype=cls.PIXEL_DTYPE)
+        return image
+
+    @classmethod
+    def from_packed(cls, packed, width):
+        """Creates an image from rows packed eight pixels per byte."""
+        pixels = np.unpackbits(np.asarray(packed, dtype=np.uint8), axis=1,
+                               count=width)
+        image = cls(max_width=width, max_height=len(pixels))
+        image.image_data = pixels
+        return image
+
+    @classmethod
+    def from_array(cls, pixels):
+        """Creates an image wrapping a 2D array of 0/1 pixels without
+        copying it.
+
+        uint8 and bool arrays are wrapped as they are, any other dtype is
+        converted first. The caller's array stays shared with the image:
+        read-only arrays are copied on the first set_pixel call, writable
+        ones are written in place."""
+        pixels = np.asarray(pixels)
+        if pixels.ndim != 2:
+            raise ValueError(f"expected a 2D pixel array, got {pixels.ndim}D")
+        if pixels.dtype == bool:
+            # same item size, so the bools can be read as bytes in place
+            pixels = pixels.view(cls.PIXEL_DTYPE)
+        elif pixels.dtype != cls.PIXEL_DTYPE:
+            pixels = pixels.astype(cls.PIXEL_DTYPE)
+        height, width = pixels.shape
+        image = cls(max_width=width, max_height=height)
+        image.image_data = pixels
+        return image
+
+    @classmethod
+    def from_buffer(cls, buffer, width):
+        """Creates an image wrapping a buffer of 0/1 bytes, one per pixel,
+        without copying it.
+
+        Any object supporting the buffer protocol works (bytes, bytearray,
+        memoryview, mmap). Immutable buffers give a read-only image that is
+        copied on the first set_pixel call."""
+        pixels = np.frombuffer(buffer, dtype=cls.PIXEL_DTYPE)
+        if width <= 0 or len(pixels) % width:
+            raise ValueError(f"a buffer of {len(pixels)} pixels doesn't "
+                             f"split into rows of {width}")
+        return cls.from_array(pixels.reshape(-1, width))
+
+    @classmethod
+    def from_ascii(cls, data):
+        """Creates an image from '*'/space rows held in one string or
+        buffer."""
+        if isinstance(data, str):
+            data = data.encode("ascii", "replace")
+        return cls.from_array(cls.parse_ascii(bytes(data)))
 
     # mutators -----------------------------------------------------------
     def set_pixel(self, row, col, value):
         """Sets the value of the pixel at the specified row and column to the
         specified value."""
-        # if the pixel is not equal to an empty space
-        if self.get_pixel(row, col) != " ":
+        # if the pixel is inside the image
+        if self.get_pixel(row, col) is not False:
+            # shared pixels are read-only, take a private copy on first write
+            if self.is_shared():
+                self.image_data = self.image_data.copy()
             # set the pixel to the designated value
-            self.image_data[row][col] = value
+            self.image_data[row, col] = value
             return True
         # else
         return False
+
     # accessors -----------------------------------------------------------
     def get_pixel(self, row, col):
         """Returns the value of the pixel at the specified row and column."""
-        if row <= self.MAX_HEIGHT and col <= self.MAX_WIDTH:
-            return self.image_data[row][col]
+        if 0 <= row < self.get_height() and 0 <= col < self.get_width():
+            return int(self.image_data[row, col])
         # else
         return False
 
+    def get_height(self):
+        """Returns the number of rows in the image."""
+        return self.image_data.shape[0]
+
+    def get_width(self):
+        """Returns the number of columns in the image."""
+        return self.image_data.shape[1]
+
+    def get_row(self, row):
+        """Returns a view of the pixels in the specified row."""
+        return self.image_data[row, :]
+
+    def get_col(self, col):
+        """Returns a view of the pixels in the specified column."""
+        return self.image_data[:, col]
+
+    def get_packed_data(self):
+        """Returns the image packed eight pixels per byte along each row."""
+        return np.packbits(self.image_data, axis=1)
+
+    def get_hash(self):
+        """Returns a digest of the size and bit-packed pixels of the image."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.array(self.image_data.shape, dtype=np.uint32))
+        digest.update(self.get_packed_data())
+        return digest.digest()
+
+    def get_view(self):
+        """Returns an image sharing these pixels without copying them.
+
+        Both images see the pixels as read-only from here on, so whichever
+        one is written to first through set_pixel copies them."""
+        if not self.is_shared():
+            self.image_data = self.image_data.view()
+            self.image_data.flags.writeable = False
+        view = BarcodeImage(max_width=self.max_width,
+                            max_height=self.max_height)
+        view.image_data = self.image_data
+        return view
+
+    def copy(self):
+        """Returns an image with its own copy of these pixels."""
+        image = BarcodeImage(max_width=self.max_width,
+                             max_height=self.max_height)
+        image.image_data = self.image_data.copy()
+        return image
+
+    def is_shared(self):
+        """Checks if the pixels are shared with a view and returns a
+        boolean."""
+        return not self.image_data.flags.writeable
+
     # instance helper ------------------------------------------------------
     def check_size(self, data):
         """Checks the size of the data to be encoded and returns a boolean."""
-        # if the data is less than the max height
-        if len(data) < self.MAX_HEIGHT:
+        # if the data fits within the max height
+        if len(data) <= self.max_height:
             # loop through the data (array) to check if the columns are less
             # than the max width
             for i in range(len(data)):
-                if len(data[i]) > self.MAX_WIDTH:
+                if len(data[i]) > self.max_width:
                     # return false if columns bigger than width
                     return False
             # return True if columns and height are within range
@@ -195,6 +349,46 @@ class BarcodeImage:
         # else
         return False
 
+    @classmethod
+    def parse_lines(cls, data):
+        """Converts string rows into a 2D array of 0/1 pixels."""
+        if not len(data):
+            return np.zeros((0, 0), dtype=cls.PIXEL_DTYPE)
+        # encode every row at once and parse them as one block
+        raw = "\n".join(map(str, data)).encode("ascii", "replace")
+        return cls.parse_ascii(raw).copy()
+
+    @classmethod
+    def parse_ascii(cls, raw):
+        """Converts '*'/space rows separated by newlines in a bytes object
+        into a 2D array of 0/1 pixels.
+
+        Rows of equal length come back as a read-only strided view of the
+        translated bytes. Shorter rows are padded with white pixels on the
+        right."""
+        if b"\r" in raw:
+            raw = raw.replace(b"\r\n", b"\n")
+        if raw.endswith(b"\n"):
+            raw = raw[:-1]
+        # turn every byte into its pixel value in a single C-level pass
+        pixels = np.frombuffer(raw.translate(cls.ASCII_TABLE),
+                               dtype=cls.PIXEL_DTYPE)
+        breaks = np.flatnonzero(np.frombuffer(raw, dtype=np.uint8) ==
+                                ord("\n"))
+        starts = np.concatenate([[0], breaks + 1])
+        lengths = np.concatenate([breaks, [len(raw)]]) - starts
+        width = int(lengths.max())
+        if (lengths == width).all():
+            # every row is width pixels followed by a newline
+            return np.lib.stride_tricks.as_strided(
+                pixels, (len(starts), width), (width + 1, 1), writeable=False)
+        # scatter ragged rows into a white grid
+        grid = np.zeros((len(starts), width), dtype=cls.PIXEL_DTYPE)
+        columns = np.arange(width)
+        inside = columns < lengths[:, np.newaxis]
+        grid[inside] = pixels[(starts[:, np.newaxis] + columns)[inside]]
+        return grid
+
 class InfoBox(BarcodeABC):
     """Implementation of the BarcodeABC abstract class, where barcodes are
     generated into text and the text can be generated out of an image.
@@ -203,13 +397,37 @@ class InfoBox(BarcodeABC):
     ----------
     General
         actual_width: int
-            The computed width of the image.
+            The computed width of the image. Measured on first access after
+            a scan.
         actual_height: int
-            The computed width of the image.
+            The row of the top border, where the image data begins. Measured
+            on first access after a scan.
+        spine_length: int
+            The number of rows the spine spans, borders included. Measured
+            on first access after a scan.
+        spine_col: int
+            The column of the spine, i.e. the left edge of the barcode.
+            Measured on first access after a scan.
         image: BarcodeImage, None
             The image data of the barcode.
+        bc: BarcodeImage, None
+            The name BarcodeABC gives the image, kept as an alias of image.
         text: str, None
-            The text data of the barcode.
+            The text data of the barcode. Decoded from a scanned image on
+            first access, unless text was read or translated since.
+        parity: bool
+            Whether the image carries a parity row and parity column for
+            error correction.
+        char_bits: int, None
+            The number of data rows (bits) per character column, one of
+            CHAR_ENCODINGS. None picks the narrowest that holds the text when
+            generating an image. Translating an image sets it to the depth
+            read off the spine.
+        confidence: np.ndarray, None
+            The confidence in every decoded character of a parity image: 1.0
+            when its column parity checks out, 0.5 when a single-bit error
+            was corrected, 0.0 when the error could not be corrected. None
+            for images without parity.
     Misc Variables
         BLACK_CHAR: str
             An asterisk that represents a black pixel in the image.
@@ -218,6 +436,33 @@ class InfoBox(BarcodeABC):
         BINARY_BASE: int
             The base used to calculate binary values during image<>text
             conversion.
+        BITS_PER_CHAR: int
+            The number of data rows (bits) encoding each character in the
+            original 8-bit layout.
+        BIT_WEIGHTS: np.ndarray
+            The value of each data row from the top down, i.e.
+            [128, 64, ..., 1].
+        COLUMN_TABLE: np.ndarray
+            An (8, 256) lookup table whose column b holds the bits of byte b,
+            most significant bit on top, exactly as drawn in the image.
+        CHAR_ENCODINGS: dict
+            The character encoding of every supported column depth: latin-1
+            bytes, UTF-16 code units or UTF-32 code points.
+        PARITY_ROWS: int
+            The number of rows a parity image adds under the data rows.
+        FRAME_CHAR: str
+            The side border drawn around rendered images.
+        FRAME_TOP_CHAR: str
+            The top border drawn over rendered images.
+        PIXEL_CHARS: np.ndarray
+            The code point drawn for a white (0) and a black (1) pixel.
+        BLOCK_CHARS: np.ndarray
+            The half-block code point drawn for every pair of stacked pixels,
+            indexed by 2 * top + bottom.
+        cache: BarcodeCache, None
+            An optional LRU cache shared by every InfoBox, consulted before
+            encoding (keyed by text) and decoding (keyed by image hash). None
+            disables caching.
 
     Methods
     ----------
@@ -225,63 +470,137 @@ class InfoBox(BarcodeABC):
         read(text):
             Read the text to be encoded into an image and return a boolean. No
             image translation is allowed here.
-        scan(image):
+        scan(image, isolate):
             Accepts an image represented as the BarcodeImage object, and stores
             it and returns a boolean.
 
-            No text translation is allowed within this method.
+            No text translation is allowed within this method. The image is
+            shared copy-on-write unless isolate is True.
         generate_image_from_text():
             Decodes internal text stored and produces a companion BarcodeImage
             and returns a boolean.
         translate_image_to_text():
             Translate the image into a string and return a boolean.
-        generate_image_side_border(col_index, row_index):
-            Generates an open or closed side border for the image and
-            returns a boolean.
-        generate_image_bottom_border(col_index, row_index):
+        generate_image_side_border(top_row, bottom_row):
+            Generates the closed left and open right side borders between the
+            top and bottom rows and returns a boolean.
+        generate_image_bottom_border(row_index):
             Generates a closed limitation line border for bottom row and
             returns boolean.
-        generate_image_top_border(col_index, row_index):
-            Generates a closed limitation line border for top row and returns
-            a boolean.
+        generate_image_top_border(row_index):
+            Generates an alternating limitation line border for top row and
+            returns a boolean.
+        generate_image_parity(top_row, char_bits):
+            Generates the parity row under the data rows and the parity
+            column after the last character and returns a boolean.
+        replace_image():
+            Drops what is known about the current image before a new one is
+            generated and returns a boolean.
     Accessors
         get_actual_height():
             Grab the actual height of the image.
         get_actual_width():
             Grab the actual width of the image.
     Instance Helpers
+        locate_signal():
+            Measures a scanned image the first time its dimensions are
+            needed and returns a boolean.
         compute_signal_height():
             Analyze the spine of the array to compute the image height.
             Returns a boolean.
         compute_signal_width():
             Analyze the spine of the array to compute the image width. Return
             boolean.
-        set_ordinal_array():
-            Creates an array of ordinal values from stored text and returns
-            the array.
+        find_bounding_box(pixels):
+            Locates the barcode in a 2D pixel array and returns its (top,
+            left, height, width), or None if there is no black pixel.
+        measure_width(box):
+            Measures the width of a barcode from its top and bottom borders
+            and returns it.
+        count_leading(line):
+            Returns the length of the unbroken run of truthy values at the
+            start of the line.
+        get_char_bits(text):
+            Returns the narrowest column depth that holds every character of
+            the text.
+        get_char_codes(text, char_bits):
+            Returns the code units of the text at the given column depth.
+        get_columns(codes, char_bits):
+            Returns the bit columns of an array of code units, most
+            significant bit on top.
+        get_bit_weights(char_bits):
+            Returns the value of each data row from the top down.
+        get_layout(spine_length):
+            Returns the column depth and parity mode a spine length records.
+        decode_codes(codes, char_bits):
+            Returns the text held by an array of code units.
+        check_parity(data_region, parity_row, parity_col, char_mask):
+            Corrects single-bit errors in a stack of parity data regions in
+            place and returns the confidence in every column.
+    Batch Methods
+        decode_batch(images, confidence):
+            Decodes a stack of barcode images in one vectorized pass and
+            returns a list of strings, plus a list of confidences if asked.
+        encode_batch(messages, parity, char_bits):
+            Encodes a list of messages into one contiguous (N, H, W) pixel
+            array and returns it with the width of every image.
+        stack_images(images, out):
+            Pads a sequence of barcode images into one (N, H, W) pixel array
+            and returns it.
+        get_pixel_arrays(images):
+            Returns the 2D pixel array of every image in a sequence of
+            barcode images, as a list.
+        render_stack(stack, widths, blocks, frame):
+            Renders every image of an (N, H, W) stack as text in one
+            vectorized lookup and returns a list of strings.
     Display Methods
-        display_image_to_console():
-            Displays the image to the console.
+        render_image(blocks, frame):
+            Renders the image as text and returns the string.
+        display_image_to_console(stream, blocks):
+            Displays the image to the console, or writes it to a text stream.
         display_text_to_console():
             Display the text to the console.
     """
     BLACK_CHAR: str = "*"
     WHITE_CHAR: str = " "
     BINARY_BASE: int = 2
+    BITS_PER_CHAR: int = 8
+    BIT_WEIGHTS = BINARY_BASE ** np.arange(BITS_PER_CHAR - 1, -1, -1)
+    COLUMN_TABLE = np.unpackbits(np.arange(256, dtype=np.uint8)[np.newaxis],
+                                 axis=0)
+    CHAR_ENCODINGS: dict = {8: "latin-1", 16: "utf-16-le", 32: "utf-32-le"}
+    PARITY_ROWS: int = 1
+    FRAME_CHAR: str = "|"
+    FRAME_TOP_CHAR: str = "-"
+    PIXEL_CHARS = np.array([ord(WHITE_CHAR), ord(BLACK_CHAR)], dtype=np.uint32)
+    BLOCK_CHARS = np.array([ord(" "), ord("\u2584"), ord("\u2580"),
+                            ord("\u2588")], dtype=np.uint32)
+    cache = None
+    __slots__ = ("_actual_width", "_actual_height", "_spine_length",
+                 "_spine_col", "_text", "_bounds_pending", "_text_pending",
+                 "image", "parity", "char_bits", "confidence")
 
-    def __init__(self, image = None, text = None):
+    def __init__(self, image = None, text = None, parity = False,
+                 char_bits = None):
+        # nothing is waiting to be measured or decoded until a scan
+        self._bounds_pending = False
+        self._text_pending = False
         super().__init__(image, text)
         # initialize width and height values as 0
         self.actual_width = 0
         self.actual_height = 0
+        self.spine_length = 0
+        self.spine_col = 0
+        # set the error correction mode used when generating an image
+        self.parity = parity
+        self.char_bits = char_bits
+        self.confidence = None
         # set the image to input/default value
         self.image = image
         # if the image input is an instance of BarcodeImage
         if isinstance(self.image, BarcodeImage):
-            # scan the image
+            # scan the image, its text is decoded when first asked for
             self.scan(image)
-            # set text to default
-            self.text = None
         # else leave image as default and read the text instead
         self.read_text(text)
 
@@ -296,16 +615,19 @@ class InfoBox(BarcodeABC):
         # else
         return True
 
-    def scan(self, image):
+    def scan(self, image, isolate = False):
         """Accepts an image represented as the BarcodeImage object, and stores
         it and returns a boolean
 
-        No text translation is allowed within this method"""
+        No text translation is allowed within this method. The stored image
+        shares the scanned pixels copy-on-write unless isolate is True, in
+        which case it gets its own copy of them."""
         if image: # if an image input exists
-            # make a deep copy of it
-            self.image.image_data = copy.deepcopy(image.image_data)
-            # compute the height
-            self.compute_signal_height()
+            # hold a copy-on-write view of it, or a private copy on request
+            self.image = image.copy() if isolate else image.get_view()
+            # leave measuring and decoding until they are first needed
+            self._bounds_pending = True
+            self._text_pending = True
             return True
         # else
         return False
@@ -313,120 +635,226 @@ class InfoBox(BarcodeABC):
     def generate_image_from_text(self):
         """Decodes internal text stored and produces a companion BarcodeImage
         and returns a boolean."""
-        ordinal_arr = self.set_ordinal_array() # adding text to an array
-        self.image = BarcodeImage(self.text) # constructing image memory space
-        top_row = self.image.MAX_HEIGHT - 11 # setting max height
-        bottom_row = self.image.MAX_HEIGHT - 1 # finding bottom row
-        self.actual_width = len(self.text) + 2 # +2 to accommodate side borders
-        bit_position = 0
-        bit = self.BINARY_BASE ** bit_position # starting at bit 1
-
-        # starting from the bottom row going up
-        for row_index in range(bottom_row, top_row, -1):
-            # starting from the left column going right
-            for col_index in range(self.actual_width):
-                # if on the bottom row, generate the closed limitation line
-                if row_index == bottom_row:
-                    self.generate_image_bottom_border(col_index, row_index)
-                # if on the top row, generate the closed limitation line
-                elif row_index - 1 == top_row:
-                    self.generate_image_top_border(col_index, row_index)
-                # if on the side columns, generate the appropriate borders
-                elif col_index == 0 or col_index == self.actual_width - 1:
-                    self.generate_image_side_border(col_index, row_index)
-                # if the position is a barcode position
-                else:
-                    # comparing ordinal value to bit value
-                    if ordinal_arr[col_index - 1] & bit:
-                        # adding +1 binary value if bit found
-                        self.image.image_data[row_index][col_index] = (
-                            self.image.BLACK_CHAR_BINARY)
-            # only shift the bit right if not constructing the border
-            if row_index != bottom_row:
-                bit = bit << 1
+        # repeated messages share the image cached the first time around
+        cache_key = ("image", self.text, self.parity, self.char_bits)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.replace_image()
+                (image, self.actual_height, self.actual_width,
+                 self.spine_length, self.spine_col) = cached
+                self.image = image.get_view()
+                return True
+        # one data row per bit of the widest character, unless set
+        char_bits = self.char_bits or self.get_char_bits(self.text)
+        # refuse characters the column depth can't hold
+        try:
+            char_codes = self.get_char_codes(self.text, char_bits)
+        except ValueError:
+            return False
+        # parity images add a parity row and a parity column
+        parity_rows = self.PARITY_ROWS if self.parity else 0
+        # +2 to accommodate side borders
+        width = len(char_codes) + 2 + parity_rows
+        # refuse messages wider than the image bounds allow, leaving any
+        # scanned image as it was
+        if width > BarcodeImage.MAX_WIDTH:
+            return False
+        self.replace_image()
+        self.actual_width = width
+        top_row = 0 # the top border is the first row of the image
+        # setting bottom border row under the data (and parity) rows
+        bottom_row = top_row + char_bits + parity_rows + 1
+        # constructing image memory space sized to the message
+        self.image = BarcodeImage.blank(bottom_row + 1, self.actual_width)
+
+        # gather the bit column of every character from the lookup table
+        # and write every data row between the borders in one assignment
+        self.image.image_data[top_row + 1:top_row + char_bits + 1,
+                              1:len(char_codes) + 1] = (
+            self.get_columns(char_codes, char_bits))
+        if self.parity:
+            self.generate_image_parity(top_row, char_bits)
+        # generate the closed limitation lines and the open borders
+        self.generate_image_bottom_border(bottom_row)
+        self.generate_image_top_border(top_row)
+        self.generate_image_side_border(top_row, bottom_row)
         self.compute_signal_height() # compute height to set the final image
+        if self.cache is not None:
+            # cache a read-only view, writes to either side copy first
+            self.cache.put(cache_key, (self.image.get_view(),
+                                       self.actual_height, self.actual_width,
+                                       self.spine_length, self.spine_col))
         return True
 
     def translate_image_to_text(self):
         """Translate the image into a string and return a boolean."""
-        # create memory space for the binary array
-        ordinal_arr = copy.deepcopy([0] * (self.get_actual_width() - 2))
+        # repeated images reuse the text decoded the first time around
+        if self.cache is not None:
+            cache_key = ("text", self.image.get_hash())
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                (self.text, self.parity, self.char_bits,
+                 self.confidence) = cached
+                return True
+        # measure the image once if a scan left that pending
+        self.locate_signal()
+        # the spine spans the data rows, the borders and any parity row
+        self.char_bits, self.parity = self.get_layout(self._spine_length)
         # start at the row right under the top border of the image
-        start_row = self.get_actual_height() + 1
-        # end at the last row (bottom border will be excluded in range)
-        end_row = BarcodeImage.MAX_HEIGHT
-        # start at column 1 to remove the left-most border
-        start_col = 1
-        # end at second to last column to remove the right-most border
-        end_col = self.get_actual_width() - 1
-        # initiate the bit position
-        bit_position = 7
-        bit = self.BINARY_BASE ** bit_position # calculate bit
-        # traverse each row starting from the top of the image going down
-        for row in range(start_row, end_row):
-            # traverse each column going from left to right
-            for col in range(start_col, end_col):
-                # if the image value at index row, col is == 1 or truthy
-                if self.image.image_data[row][col]:
-                    # add the ordinal value to the array. Subtracting
-                    # col - 1 since the loop starts at column 1 to remove the
-                    # border (column 0), but the ordinal array starts at index 0
-                    ordinal_arr[col - 1] += bit
-            # advance bit position
-            bit = bit >> 1
-
-        # updating self.text to empty string to add the message
-        self.text = ""
-        for i in ordinal_arr:
-            # converting each number in the array to a character value
-            binary_string = chr(i)
-            # assigning text attribute to the string value
-            self.text += binary_string
+        start_row = self._actual_height + 1
+        # stop before the bottom border (or parity row) of the image
+        end_row = start_row + self.char_bits
+        # start right of the spine to remove the left-most border
+        left_col = self._spine_col
+        start_col = left_col + 1
+        # end at second to last column to remove the right-most border, or
+        # before the parity column next to it
+        right_col = left_col + self._actual_width
+        end_col = right_col - 1 - (self.PARITY_ROWS if self.parity else 0)
+        if self.parity:
+            pixels = self.image.image_data
+            # take a private copy of the data rows so errors can be fixed
+            data_region = pixels[np.newaxis, start_row:end_row,
+                                 left_col:right_col].copy()
+            char_mask = np.zeros((1, right_col - left_col), dtype=bool)
+            char_mask[0, 1:end_col - left_col] = True
+            self.confidence = self.check_parity(
+                data_region, pixels[np.newaxis, end_row, left_col:right_col],
+                pixels[np.newaxis, start_row:end_row + 1, end_col],
+                char_mask)[0, 1:end_col - left_col]
+            data_region = data_region[0, :, 1:end_col - left_col]
+        else:
+            self.confidence = None
+            # slice the data region out of the image: one row per bit, one
+            # column per character
+            data_region = self.image.image_data[start_row:end_row,
+                                                start_col:end_col]
+        # weight each row by its bit value and sum down every column at once
+        ordinal_arr = (self.get_bit_weights(self.char_bits)[:len(data_region)]
+                       @ data_region)
+        # updating self.text with every character value in a single decode
+        self.text = self.decode_codes(ordinal_arr, self.char_bits)
+        if self.cache is not None:
+            self.cache.put(cache_key, (self.text, self.parity, self.char_bits,
+                                       self.confidence))
         return True
 
-    def generate_image_side_border(self, col_index, row_index):
-        """Generates an open or closed side border for the image and
-        returns a boolean"""
-        # if the item is in the first column, generate the closed limitation
-        # line
-        if col_index == 0:
-            self.image.image_data[row_index][col_index] = (
-                self.image.BLACK_CHAR_BINARY)
-            return True
-        # if the item is in the last column
-        elif col_index == self.actual_width - 1:
-            # if the row is even
-            if row_index % 2 != 0:
-                # generate the open borderline piece
-                self.image.image_data[row_index][col_index] = (
-                    self.image.BLACK_CHAR_BINARY)
-                return True
-            # else don't do anything, leave the value == 0 / white space
-            return False
-        # else don't do anything and return
-        return False
+    def generate_image_side_border(self, top_row, bottom_row):
+        """Generates the closed left and open right side borders between the
+        top and bottom rows and returns a boolean"""
+        # generate the closed limitation line down the first column
+        self.image.image_data[top_row:bottom_row + 1, 0] = (
+            self.image.BLACK_CHAR_BINARY)
+        # generate the open borderline pieces on every other row of the
+        # last column, starting right under the top border
+        self.image.image_data[top_row + 1:bottom_row:2,
+                              self.actual_width - 1] = (
+            self.image.BLACK_CHAR_BINARY)
+        return True
 
-    def generate_image_bottom_border(self, col_index, row_index):
+    def generate_image_bottom_border(self, row_index):
         """Generates a closed limitation line border for bottom row and
         returns boolean"""
-        # add a black character for the closed limitation line border and return
-        self.image.image_data[row_index][col_index] = (
+        # add black characters across the full width and return
+        self.image.image_data[row_index, :self.actual_width] = (
             self.image.BLACK_CHAR_BINARY)
         return True
 
-    def generate_image_top_border(self, col_index, row_index):
-        """Generates a closed limitation line border for top row and returns
-        a boolean"""
-        # if the column is even
-        if col_index % 2 == 0:
-            # add a black character for the border and return
-            self.image.image_data[row_index][col_index] = (
-                self.image.BLACK_CHAR_BINARY)
-            return True
-        # else don't fill in the space (leave it as 0/white) and return
-        return False
+    def generate_image_top_border(self, row_index):
+        """Generates an alternating limitation line border for top row and
+        returns a boolean"""
+        # add a black character to every even column, leaving the odd columns
+        # as 0/white, and return
+        self.image.image_data[row_index, :self.actual_width:2] = (
+            self.image.BLACK_CHAR_BINARY)
+        return True
+
+    def generate_image_parity(self, top_row, char_bits):
+        """Generates the parity row under the data rows and the parity
+        column after the last character and returns a boolean"""
+        pixels = self.image.image_data
+        data_end = top_row + char_bits + 1
+        # the parity column sits right of the last character column
+        text_end = self.actual_width - 2
+        # give every character column an even number of black pixels
+        pixels[data_end, 1:text_end] = (
+            pixels[top_row + 1:data_end, 1:text_end].sum(axis=0) % 2)
+        # give every data row, and the parity row itself, an even number of
+        # black pixels across the characters
+        pixels[top_row + 1:data_end + 1, text_end] = (
+            pixels[top_row + 1:data_end + 1, 1:text_end].sum(axis=1) % 2)
+        return True
+
+    def replace_image(self):
+        """Drops what is known about the current image before a new one is
+        generated and returns a boolean."""
+        # the new image replaces any scanned one still waiting to be measured
+        self._bounds_pending = False
+        # nor does a decode of the scanned image say anything about it
+        self.confidence = None
+        return True
 
     # accessors ----------------------------------------------------------
+    @property
+    def bc(self):
+        return self.image
+
+    @bc.setter
+    def bc(self, value):
+        self.image = value
+
+    @property
+    def actual_width(self):
+        self.locate_signal()
+        return self._actual_width
+
+    @actual_width.setter
+    def actual_width(self, value):
+        self._actual_width = value
+
+    @property
+    def actual_height(self):
+        self.locate_signal()
+        return self._actual_height
+
+    @actual_height.setter
+    def actual_height(self, value):
+        self._actual_height = value
+
+    @property
+    def spine_length(self):
+        self.locate_signal()
+        return self._spine_length
+
+    @spine_length.setter
+    def spine_length(self, value):
+        self._spine_length = value
+
+    @property
+    def spine_col(self):
+        self.locate_signal()
+        return self._spine_col
+
+    @spine_col.setter
+    def spine_col(self, value):
+        self._spine_col = value
+
+    @property
+    def text(self):
+        if self._text_pending:
+            self._text_pending = False
+            # a scan without a barcode in it leaves nothing to decode
+            if self.spine_length:
+                self.translate_image_to_text()
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        # text read or translated replaces any decode still pending
+        self._text_pending = False
+        self._text = value
+
     def get_actual_height(self):
         """Grab the actual height of the image"""
         return self.actual_height
@@ -436,83 +864,449 @@ class InfoBox(BarcodeABC):
         return self.actual_width
 
     # instance helpers  --------------------------------------------------
+    def locate_signal(self):
+        """Measures a scanned image the first time its dimensions are
+        needed and returns a boolean."""
+        if not self._bounds_pending:
+            return True
+        return self.compute_signal_height()
+
     def compute_signal_height(self):
         """Analyze the spine of the array to compute the image height.
         Returns a boolean"""
-        # traverse the image_data array starting from each row
-        for row in range(BarcodeImage.MAX_HEIGHT):
-            # check the first column in each row
-            for col in range(1):
-                # if the column is a truthy value (1)
-                if self.image.get_pixel(row, col):
-                    # set the height to the difference between the max height
-                    # and the row, the value was found (marks the beginning
-                    # of the image data)
-                    self.actual_height = row
-                    # calculate the width and return True
-                    self.compute_signal_width()
-                    return True
+        self._bounds_pending = False
+        # locate the spine wherever the barcode sits in the image
+        box = self.find_bounding_box(self.image.image_data)
         # if nothing found return False
-        return False
+        if box is None:
+            return False
+        # the top border marks the beginning of the image data, the spine
+        # runs down from it to the closed limitation line, and the borders
+        # it spans give the width
+        (self.actual_height, self.spine_col, self.spine_length,
+         self.actual_width) = box
+        return True
 
     def compute_signal_width(self):
         """Analyze the spine of the array to compute the image width. Return
         boolean"""
-        # grab the top row of the image
-        top_row = self.image.image_data[self.actual_height]
-
-        # traverse every other character in the row
-        for col in range(0, len(top_row), 2):
-            active_column = top_row[col]
-            # grab the column next to the active column for comparison
-            next_column = top_row[col + 1]
-            # if the active column and next column follow the '1, 0' pattern,
-            # move onto the next column (this is the border)
-            if (active_column == BarcodeImage.BLACK_CHAR_BINARY and
-                    next_column == BarcodeImage.WHITE_CHAR_BINARY):
-                continue
-            else:  # if no more border characters are found
-                # set the width's edge to the previous column and return
-                self.actual_width = col - 1
-                return True
-        return False
+        top_row = self.actual_height
+        # measure the borders of the rows the spine spans, right of the spine
+        self.actual_width = self.measure_width(
+            self.image.image_data[top_row:top_row + self.spine_length,
+                                  self.spine_col:])
+        return self.actual_width > 0
+
+    @classmethod
+    def find_bounding_box(cls, pixels):
+        """Locates the barcode in a 2D pixel array and returns its (top,
+        left, height, width), or None if there is no black pixel.
+
+        The spine is the left-most column holding a black pixel. Its first
+        black pixel is the top-left corner and its unbroken run down to the
+        closed limitation line is the height."""
+        # one reduction down the columns finds the spine
+        black_cols = np.flatnonzero(pixels.any(axis=0))
+        if not len(black_cols):
+            return None
+        left = int(black_cols[0])
+        spine = pixels[:, left]
+        top = int(spine.argmax())
+        height = cls.count_leading(spine[top:])
+        width = cls.measure_width(pixels[top:top + height, left:])
+        return top, left, height, width
 
-    def set_ordinal_array(self):
-        """Creates an array of ordinal values from stored text and returns
-        the array"""
-        # adding letters to the ordinal array
-        ordinal_arr = []
-        for char in self.text:
-            ordinal_arr.append(ord(char))
-        return ordinal_arr
+    @classmethod
+    def measure_width(cls, box):
+        """Measures the width of a barcode from its top and bottom borders
+        and returns it.
+
+        box holds the rows of the barcode, top border first and closed
+        limitation line last, starting at the spine. A smudge that cuts the
+        closed limitation line short is outvoted by the top border, but the
+        top border may only run past the limitation line as far as the first
+        column drawn as the open right border with a white column after it.
+        Otherwise a barcode one white column away, whose top border carries
+        on the same pattern, would be taken as part of this one."""
+        if not box.size:
+            return 0
+        # the top border is black on every even column, white on every odd
+        top_width = cls.count_leading(
+            box[0] == (np.arange(box.shape[1]) % 2 == 0))
+        # the pattern runs one white column past an odd width, the open
+        # right border under it tells the two apart
+        if top_width and len(box) > 1 and not box[1, top_width - 1]:
+            top_width -= 1
+        # the closed limitation line runs unbroken across the full width
+        bottom_width = cls.count_leading(box[-1])
+        if top_width <= bottom_width:
+            return bottom_width
+        # the open right border is black on every other row between the
+        # borders, starting right under the top border, and white between
+        first_col = max(bottom_width, 1) - 1
+        border = np.arange(len(box) - 2) % 2 == 0
+        candidates = box[1:-1, first_col:top_width] != 0
+        # a data column can follow the same pattern, but only the right
+        # border has a white column (or the edge of the box) after it
+        white_after = np.append(~box.any(axis=0), True)[
+            first_col + 1:top_width + 1]
+        right_borders = np.flatnonzero(
+            (candidates == border[:, np.newaxis]).all(axis=0) & white_after)
+        if len(right_borders):
+            return first_col + int(right_borders[0]) + 1
+        return top_width
+
+    @staticmethod
+    def count_leading(line):
+        """Returns the length of the unbroken run of truthy values at the
+        start of the line."""
+        line = np.asarray(line, dtype=bool)
+        # argmin finds the first falsy value, unless there is none
+        return len(line) if line.all() else int(line.argmin())
+
+    @classmethod
+    def get_char_bits(cls, text):
+        """Returns the narrowest column depth that holds every character of
+        the text."""
+        code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        # latin-1 fits a byte, everything else fits UTF-16 code units
+        if not len(code_points) or code_points.max() < 256:
+            return cls.BITS_PER_CHAR
+        return 16
+
+    @classmethod
+    def get_char_codes(cls, text, char_bits):
+        """Returns the code units of the text at the given column depth."""
+        try:
+            raw = text.encode(cls.CHAR_ENCODINGS[char_bits])
+        except KeyError:
+            raise ValueError(f"columns of {char_bits} bits aren't supported, "
+                             f"use one of {list(cls.CHAR_ENCODINGS)}")
+        except UnicodeEncodeError as error:
+            raise ValueError(f"{char_bits}-bit columns can't hold "
+                             f"{error.object[error.start]!r}") from error
+        return np.frombuffer(raw, dtype=f"<u{char_bits // 8}")
+
+    @classmethod
+    def get_columns(cls, codes, char_bits):
+        """Returns the bit columns of an array of code units, most
+        significant bit on top."""
+        # stack the byte table's columns, most significant byte on top
+        return np.concatenate([cls.COLUMN_TABLE[:, (codes >> shift) & 0xFF]
+                               for shift in range(char_bits - 8, -1, -8)])
+
+    @classmethod
+    def get_bit_weights(cls, char_bits):
+        """Returns the value of each data row from the top down."""
+        return cls.BINARY_BASE ** np.arange(char_bits - 1, -1, -1,
+                                            dtype=np.int64)
+
+    @classmethod
+    def get_layout(cls, spine_length):
+        """Returns the column depth and parity mode a spine length records.
+
+        The spine spans the top and bottom borders, one row per bit and the
+        parity row if there is one, so every supported layout has a length
+        of its own. Anything else is read as the original 8-bit layout."""
+        for char_bits in cls.CHAR_ENCODINGS:
+            if spine_length == char_bits + 2:
+                return char_bits, False
+            if spine_length == char_bits + cls.PARITY_ROWS + 2:
+                return char_bits, True
+        return cls.BITS_PER_CHAR, False
+
+    @classmethod
+    def decode_codes(cls, codes, char_bits):
+        """Returns the text held by an array of code units."""
+        raw = np.asarray(codes).astype(f"<u{char_bits // 8}").tobytes()
+        # damaged wide columns can hold invalid code units, never raise
+        return raw.decode(cls.CHAR_ENCODINGS[char_bits], errors="replace")
+
+    @classmethod
+    def check_parity(cls, data_region, parity_row, parity_col, char_mask):
+        """Corrects single-bit errors in a stack of parity data regions in
+        place and returns the confidence in every column.
+
+        data_region is (N, bits, W), parity_row and char_mask are (N, W) and
+        parity_col is (N, bits + 1), the last entry being the parity of the
+        parity row."""
+        char_bits = data_region.shape[1]
+        masked = data_region & char_mask[:, np.newaxis, :]
+        # a failed check marks the column and the row holding a flipped bit
+        column_errors = ((masked.sum(axis=1) + parity_row) % 2).astype(bool)
+        column_errors &= char_mask
+        row_errors = ((masked.sum(axis=2) + parity_col[:, :char_bits])
+                      % 2).astype(bool)
+        column_counts = column_errors.sum(axis=1)
+        row_counts = row_errors.sum(axis=1)
+        # one failed column and one failed row pin a flipped data bit, flip
+        # it back
+        fixable = np.flatnonzero((column_counts == 1) & (row_counts == 1))
+        data_region[fixable, row_errors[fixable].argmax(axis=1),
+                    column_errors[fixable].argmax(axis=1)] ^= 1
+        # a lone failed column or row is a flipped parity bit, the data is
+        # still good; anything more is beyond a single-bit correction
+        corrected = (column_counts <= 1) & (row_counts <= 1)
+        return np.where(column_errors,
+                        np.where(corrected[:, np.newaxis], 0.5, 0.0), 1.0)
+
+    # batch methods -------------------------------------------------------
+    @classmethod
+    def decode_batch(cls, images, confidence = False):
+        """Decodes a stack of barcode images in one vectorized pass and
+        returns a list of strings, plus a list of confidences if asked.
+
+        Parity images are error-corrected the same way as
+        translate_image_to_text, and their confidences are arrays with one
+        entry per character. Images without parity get None."""
+        stack = cls.stack_images(images)
+        count, height, width = stack.shape
+        if not count or not height or not width:
+            texts = [""] * count
+            return (texts, [None] * count) if confidence else texts
+        image_index = np.arange(count)
+        column_index = np.arange(width)
+        # the spine is the closed limitation line down the first column, its
+        # first black pixel marks the top border of every image
+        spines = stack[:, :, 0]
+        found = spines.any(axis=1)
+        top_rows = spines.argmax(axis=1)
+        # follow every spine down to its closed limitation line
+        below_top = np.arange(height) >= top_rows[:, np.newaxis]
+        spine_lengths = np.cumprod(np.where(below_top, spines, 1),
+                                   axis=1).sum(axis=1, dtype=np.intp) - top_rows
+        bottom_rows = np.maximum(top_rows + spine_lengths - 1, 0)
+        first_rows = np.minimum(top_rows + 1, height - 1)
+        # the width of each image is the longer of its alternating top border
+        # and the unbroken black run along its bottom border
+        top_border = stack[image_index, top_rows]
+        top_widths = np.cumprod(top_border == (column_index % 2 == 0),
+                                axis=1).sum(axis=1, dtype=np.intp)
+        # the alternating pattern runs one white column past an odd width,
+        # the open right border under it tells the two apart
+        right_cols = np.maximum(top_widths - 1, 0)
+        top_widths -= stack[image_index, first_rows, right_cols] == 0
+        bottom_widths = np.cumprod(stack[image_index, bottom_rows],
+                                   axis=1).sum(axis=1, dtype=np.intp)
+        widths = np.maximum(top_widths, bottom_widths)
+        texts = [""] * count
+        confidences = [None] * count
+        # decode every layout present (column depth and parity) as one group
+        layouts = {}
+        for spine_length in np.unique(spine_lengths[found]):
+            layouts.setdefault(cls.get_layout(spine_length),
+                               []).append(spine_length)
+        for (char_bits, parity), layout_lengths in layouts.items():
+            group = np.flatnonzero(found &
+                                   np.isin(spine_lengths, layout_lengths))
+            # gather the data rows under each top border (clipped so
+            # malformed images can't index past the canvas)
+            data_rows = np.minimum(top_rows[group, np.newaxis] +
+                                   np.arange(1, char_bits + 1), height - 1)
+            data_region = stack[group[:, np.newaxis], data_rows]
+            # characters end before the right border, and before the parity
+            # column of parity images
+            end_cols = widths[group] - 1 - (cls.PARITY_ROWS if parity else 0)
+            if parity:
+                char_mask = ((column_index >= 1) &
+                             (column_index < end_cols[:, np.newaxis]))
+                parity_rows = np.minimum(top_rows[group, np.newaxis] +
+                                         np.arange(1, char_bits + 2),
+                                         height - 1)
+                parity_col = stack[group[:, np.newaxis], parity_rows,
+                                   end_cols[:, np.newaxis]]
+                column_confidence = cls.check_parity(
+                    data_region, stack[group, parity_rows[:, -1]],
+                    parity_col, char_mask)
+            # weight each row by its bit value and sum down every column of
+            # every image in the group at once
+            ordinal_arr = (cls.get_bit_weights(char_bits) @ data_region
+                           ).astype(f"<u{char_bits // 8}")
+            encoding = cls.CHAR_ENCODINGS[char_bits]
+            for index, codes, end_col in zip(group.tolist(), ordinal_arr,
+                                             end_cols.tolist()):
+                texts[index] = (codes[1:end_col].tobytes()
+                                .decode(encoding, errors="replace"))
+            if parity:
+                for index, column_scores, end_col in zip(
+                        group.tolist(), column_confidence, end_cols.tolist()):
+                    confidences[index] = column_scores[1:end_col]
+        return (texts, confidences) if confidence else texts
+
+    @classmethod
+    def encode_batch(cls, messages, parity = False, char_bits = None):
+        """Encodes a list of messages into one contiguous (N, H, W) pixel
+        array and returns it with the width of every image.
+
+        Every image is anchored to the top-left corner of its slot and
+        padded with white pixels out to the widest message. With parity,
+        every image gets the parity row and column generate_image_parity
+        adds. All images share one column depth, by default the narrowest
+        that holds every message. Raises ValueError if char_bits is too
+        narrow for a message."""
+        count = len(messages)
+        parity_rows = cls.PARITY_ROWS if parity else 0
+        # grab the code units of every message in one pass
+        joined = "".join(messages)
+        char_bits = char_bits or cls.get_char_bits(joined)
+        char_codes = cls.get_char_codes(joined, char_bits)
+        if len(char_codes) == len(joined):
+            lengths = np.fromiter(map(len, messages), dtype=np.intp,
+                                  count=count)
+        else:
+            # characters outside the BMP take two UTF-16 code units
+            encoding = cls.CHAR_ENCODINGS[char_bits]
+            lengths = np.fromiter((len(message.encode(encoding)) * 8 //
+                                   char_bits for message in messages),
+                                  dtype=np.intp, count=count)
+        # +2 to accommodate side borders
+        widths = lengths + 2 + parity_rows
+        # +2 for the top and bottom borders
+        height = char_bits + 2 + parity_rows
+        width = int(widths.max()) if count else 0
+        stack = np.zeros((count, height, width),
+                         dtype=BarcodeImage.PIXEL_DTYPE)
+        if not count:
+            return stack, widths
+        # scatter the code units into a zero-padded (N, longest message) grid
+        grid_width = width - 2 - parity_rows
+        char_grid = np.zeros((count, grid_width), dtype=char_codes.dtype)
+        char_grid[np.arange(grid_width) < lengths[:, np.newaxis]] = char_codes
+        # gather the bit column of every character from the lookup table
+        data_end = char_bits + 1
+        stack[:, 1:data_end, 1:grid_width + 1] = (
+            cls.get_columns(char_grid, char_bits).transpose(1, 0, 2))
+        if parity:
+            # even parity down every character column, then across every
+            # data row and the parity row into the column after the text
+            stack[:, data_end, 1:grid_width + 1] = (
+                stack[:, 1:data_end, 1:grid_width + 1].sum(axis=1) % 2)
+            stack[np.arange(count)[:, np.newaxis], np.arange(1, data_end + 1),
+                  (lengths + 1)[:, np.newaxis]] = (
+                stack[:, 1:data_end + 1, 1:grid_width + 1].sum(axis=2) % 2)
+        # mask out the columns past the right edge of each image
+        inside = np.arange(width) < widths[:, np.newaxis]
+        # generate the closed limitation lines along the bottom and the
+        # spine, and the alternating top border
+        stack[:, height - 1, :] = inside
+        stack[:, 0, :] = inside
+        stack[:, 0, 1::2] = BarcodeImage.WHITE_CHAR_BINARY
+        stack[:, :, 0] = BarcodeImage.BLACK_CHAR_BINARY
+        # generate the open right border on every other row, starting right
+        # under the top border
+        open_rows = np.arange(1, height - 1, 2)
+        stack[np.arange(count)[:, np.newaxis], open_rows,
+              (widths - 1)[:, np.newaxis]] = BarcodeImage.BLACK_CHAR_BINARY
+        return stack, widths
+
+    @classmethod
+    def stack_images(cls, images, out = None):
+        """Pads a sequence of barcode images into one (N, H, W) pixel array
+        and returns it.
+
+        Accepts an (N, H, W) array as is, or any sequence of BarcodeImage
+        objects, 2D pixel arrays and lists of strings like those passed to
+        BarcodeImage. Smaller images are anchored to the bottom-left corner,
+        the same way BarcodeImage places parsed strings. With out, the
+        images are stacked into that array instead of a new one, and it
+        must be exactly large enough to hold them."""
+        if (out is None and isinstance(images, np.ndarray) and
+                images.ndim == 3 and images.dtype.kind in "biu"):
+            return images
+        pixel_arrays = cls.get_pixel_arrays(images)
+        height = max((pixels.shape[0] for pixels in pixel_arrays), default=0)
+        width = max((pixels.shape[1] for pixels in pixel_arrays), default=0)
+        if out is None:
+            stack = np.zeros((len(pixel_arrays), height, width),
+                             dtype=BarcodeImage.PIXEL_DTYPE)
+        else:
+            if out.shape != (len(pixel_arrays), height, width):
+                raise ValueError(f"can't stack {len(pixel_arrays)} images of "
+                                 f"up to {height}x{width} into an array of "
+                                 f"shape {out.shape}")
+            stack = out
+            stack[...] = 0
+        for index, pixels in enumerate(pixel_arrays):
+            stack[index, height - pixels.shape[0]:,
+                  :pixels.shape[1]] = pixels
+        return stack
+
+    @classmethod
+    def get_pixel_arrays(cls, images):
+        """Returns the 2D pixel array of every image in a sequence of
+        BarcodeImage objects, 2D pixel arrays and lists of strings, or of an
+        (N, H, W) array, as a list."""
+        pixel_arrays = []
+        for image in images:
+            if isinstance(image, BarcodeImage):
+                pixel_arrays.append(image.image_data)
+            elif (isinstance(image, np.ndarray) and
+                  image.dtype.kind in "biu"):
+                pixel_arrays.append(image)
+            else:
+                pixel_arrays.append(BarcodeImage.parse_lines(image))
+        return pixel_arrays
+
+    @classmethod
+    def render_stack(cls, stack, widths, blocks = False, frame = True):
+        """Renders every image of an (N, H, W) stack as text in one
+        vectorized lookup and returns a list of strings.
+
+        Every image is cut to its width and drawn one line per pixel row, or
+        with blocks, one line per two pixel rows using half-block
+        characters. With frame, every line is wrapped in FRAME_CHAR under a
+        FRAME_TOP_CHAR line, as display_image_to_console draws it."""
+        stack = np.asarray(stack)
+        count, height, width = stack.shape
+        widths = np.asarray(widths, dtype=np.intp)
+        if blocks:
+            # pair every row with the one under it, padding odd heights
+            if height % 2:
+                stack = np.concatenate(
+                    [stack, np.zeros((count, 1, width), dtype=stack.dtype)],
+                    axis=1)
+            codes = cls.BLOCK_CHARS[2 * stack[:, 0::2] + stack[:, 1::2]]
+        else:
+            codes = cls.PIXEL_CHARS[stack]
+        margin = 1 if frame else 0
+        # lay every line out with room for the frame and its line break
+        lines = np.empty((count, codes.shape[1], width + 2 * margin + 1),
+                         dtype=np.uint32)
+        lines[:, :, margin:margin + width] = codes
+        image_index = np.arange(count)
+        if frame:
+            lines[:, :, 0] = ord(cls.FRAME_CHAR)
+            lines[image_index, :, widths + margin] = ord(cls.FRAME_CHAR)
+        lines[image_index, :, widths + 2 * margin] = ord("\n")
+        texts = []
+        for index, image_width in enumerate(widths):
+            text = (lines[index, :, :image_width + 2 * margin + 1].tobytes()
+                    .decode("utf-32-le"))
+            if frame:
+                # 2 hugs sides borders
+                text = cls.FRAME_TOP_CHAR * (image_width + 2) + "\n" + text
+            texts.append(text)
+        return texts
 
     # display methods -----------------------------------------------------
-    def display_image_to_console(self):
-        """Displays the image to the console."""
-        # create top and side borders
-        top_border = "-" * (self.get_actual_width() + 2) # 2 hugs sides borders
-        side_border = "|"
-        # add top border to the output
-        output = top_border + "\n"
-        # grab only the rows with image content
-        image_rows = self.image.image_data[self.get_actual_height():]
-        # loop through each row
-        for row in image_rows:
-            # at the start of each row add the left-side border
-            output += side_border
-            # loop through each column only grabbing the left-most filled
-            # image data
-            for col in row[:self.get_actual_width()]:
-                # if the column is truthy, i.e., 1
-                if col:
-                    # print an asterisk (black character)
-                    output += self.BLACK_CHAR
-                # if the column is false, i.e., 0 print a white character
-                else:
-                    output += self.WHITE_CHAR
-            # at the end of each row add the right-side border
-            output += side_border + "\n"
-        print(output)
+    def render_image(self, blocks = False, frame = True):
+        """Renders the image as text and returns the string."""
+        # grab only the rows and columns with image content
+        top_row = self.get_actual_height()
+        left_col = self.spine_col
+        box = self.image.image_data[top_row:top_row + self.spine_length,
+                                    left_col:left_col + self.get_actual_width()]
+        return self.render_stack(box[np.newaxis], [box.shape[1]], blocks,
+                                 frame)[0]
+
+    def display_image_to_console(self, stream = None, blocks = False):
+        """Displays the image to the console, or writes it to a text
+        stream."""
+        output = self.render_image(blocks)
+        if stream is None:
+            print(output)
+        else:
+            stream.write(output + "\n")
 
     def display_text_to_console(self):
         """Display the text to the console"""
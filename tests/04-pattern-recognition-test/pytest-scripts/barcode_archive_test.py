@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from barcode_archive import BarcodeArchive, BarcodeArchiveWriter
+from stars_and_stripes import BarcodeImage, InfoBox
+
+# Test Data ----------------------------------------
+MESSAGES = ["Wonderful, you are awesome!", "ab", "", "x" * 70]
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def archive_path(tmp_path):
+    stack, widths = InfoBox.encode_batch(MESSAGES)
+    path = tmp_path / "labels.ssba"
+    with BarcodeArchiveWriter(path) as writer:
+        writer.add_stack(stack, widths)
+    return path
+
+# BarcodeArchive ----------------------------------------
+def test_archive_decodes_any_record_by_index(archive_path):
+    # Act
+    with BarcodeArchive(archive_path) as archive:
+        texts = [archive.decode(index) for index in (3, 0, 2, 1)]
+        count = len(archive)
+
+    # Assert
+    assert count == len(MESSAGES)
+    assert texts == [MESSAGES[3], MESSAGES[0], MESSAGES[2], MESSAGES[1]]
+
+def test_archive_stores_bit_packed_pixels(archive_path):
+    # Arrange
+    ascii_size = sum((len(message) + 3) * 10 for message in MESSAGES)
+
+    # Assert
+    assert archive_path.stat().st_size * 4 < ascii_size
+
+def test_archive_images_match_written_images(tmp_path):
+    # Arrange
+    image = BarcodeImage(["* * *", "*   *", "** * ", "*****"])
+    path = tmp_path / "single.ssba"
+    with BarcodeArchiveWriter(path) as writer:
+        writer.add_image(image)
+
+    # Act
+    with BarcodeArchive(path) as archive:
+        stored = archive.get_image(0)
+
+    # Assert
+    assert np.array_equal(stored.image_data, image.image_data)
+
+def test_archive_rejects_other_files(tmp_path):
+    # Arrange
+    path = tmp_path / "not_an_archive.txt"
+    path.write_bytes(b"* * * * *\n" * 10)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        BarcodeArchive(path)
@@ -0,0 +1,36 @@
+from barcode_benchmark import BarcodeBenchmark
+from stars_and_stripes import InfoBox
+
+# BarcodeBenchmark ----------------------------------------
+def test_run_reports_every_case_at_every_length():
+    # Arrange
+    benchmark = BarcodeBenchmark([1, 5], batch_size=4, min_time=0.001,
+                                 rounds=1)
+
+    # Act
+    results = benchmark.run()
+
+    # Assert
+    cases = [(row["case"], row["length"]) for row in results["results"]]
+    assert len(cases) == len(set(cases)) == 16
+    assert all(row["ops_per_sec"] > 0 and row["peak_bytes"] > 0
+               for row in results["results"])
+    assert "python" in results["environment"]
+    assert InfoBox.cache is None
+
+def test_compare_flags_only_slower_cases():
+    # Arrange
+    baseline = {"results": [
+        {"case": "encode", "length": 1, "ops_per_sec": 100.0},
+        {"case": "decode", "length": 1, "ops_per_sec": 100.0}]}
+    results = {"results": [
+        {"case": "encode", "length": 1, "ops_per_sec": 50.0},
+        {"case": "decode", "length": 1, "ops_per_sec": 95.0},
+        {"case": "render", "length": 1, "ops_per_sec": 1.0}]}
+
+    # Act
+    regressions = BarcodeBenchmark().compare(results, baseline)
+
+    # Assert
+    assert [row["case"] for row in regressions] == ["encode"]
+    assert regressions[0]["ratio"] == 0.5
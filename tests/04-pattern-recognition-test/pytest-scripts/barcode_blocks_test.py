@@ -0,0 +1,82 @@
+import pytest
+
+from barcode_blocks import BlockReassembler, MultiBlockCodec
+from stars_and_stripes import InfoBox
+
+# Test Data ----------------------------------------
+LONG_PAYLOAD = "".join(f"record {number:04d};" for number in range(300))
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def codec():
+    return MultiBlockCodec(block_size=40)
+
+# MultiBlockCodec ----------------------------------------
+def test_encode_then_decode_round_trips(codec):
+    # Act
+    stack, widths = codec.encode(LONG_PAYLOAD)
+
+    # Assert
+    assert len(stack) == -(-len(LONG_PAYLOAD) // 40)
+    assert widths.max() == 40 + MultiBlockCodec.HEADER_LENGTH + 2
+    assert codec.decode(stack) == LONG_PAYLOAD
+
+def test_decode_accepts_blocks_out_of_order(codec):
+    # Arrange
+    stack, _ = codec.encode(LONG_PAYLOAD)
+
+    # Act / Assert
+    assert codec.decode(stack[::-1]) == LONG_PAYLOAD
+
+def test_empty_payload_uses_one_block(codec):
+    # Act
+    stack, _ = codec.encode("")
+
+    # Assert
+    assert len(stack) == 1
+    assert codec.decode(stack) == ""
+
+def test_decode_missing_block_raises(codec):
+    # Arrange
+    stack, _ = codec.encode(LONG_PAYLOAD)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        codec.decode(stack[1:])
+
+# BlockReassembler ----------------------------------------
+def test_reassembler_emits_text_as_blocks_become_contiguous(codec):
+    # Arrange
+    first, second, third = codec.split_text("a" * 40 + "b" * 40 + "c")
+    reassembler = BlockReassembler()
+
+    # Act / Assert
+    assert reassembler.add_block(second) == ""
+    assert reassembler.get_missing_count() == 3
+    assert reassembler.add_block(first) == "a" * 40 + "b" * 40
+    assert reassembler.add_block(first) == ""
+    assert not reassembler.is_complete()
+    assert reassembler.add_block(third) == "c"
+    assert reassembler.is_complete()
+
+def test_reassembler_decodes_image_batches(codec):
+    # Arrange
+    stack, _ = codec.encode(LONG_PAYLOAD)
+    reassembler = BlockReassembler()
+
+    # Act
+    text = "".join(reassembler.add_images(stack[start:start + 5])
+                   for start in range(0, len(stack), 5))
+
+    # Assert
+    assert text == LONG_PAYLOAD
+    assert reassembler.is_complete()
+
+def test_reassembler_rejects_mixed_sequences(codec):
+    # Arrange
+    reassembler = BlockReassembler()
+    reassembler.add_block(codec.split_text("x" * 100)[0])
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        reassembler.add_block(codec.split_text("short")[0])
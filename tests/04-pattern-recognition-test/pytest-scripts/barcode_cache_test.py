@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from barcode_cache import BarcodeCache
+from stars_and_stripes import BarcodeImage, InfoBox
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def cache():
+    """Attaches a small cache to every InfoBox for the length of a test."""
+    barcode_cache = BarcodeCache(max_size=2)
+    InfoBox.cache = barcode_cache
+    yield barcode_cache
+    InfoBox.cache = None
+
+# BarcodeCache ----------------------------------------
+def test_cache_evicts_least_recently_used():
+    # Arrange
+    barcode_cache = BarcodeCache(max_size=2)
+    barcode_cache.put("a", 1)
+    barcode_cache.put("b", 2)
+
+    # Act
+    barcode_cache.get("a")
+    barcode_cache.put("c", 3)
+
+    # Assert
+    assert barcode_cache.get("b") is None
+    assert barcode_cache.get("a") == 1
+    assert barcode_cache.get_stats() == {"size": 2, "max_size": 2, "hits": 2,
+                                         "misses": 1, "evictions": 1}
+
+# InfoBox Integration ----------------------------------------
+def test_repeated_message_shares_cached_image(cache):
+    # Arrange
+    first = InfoBox(None, "SKU-1234")
+    second = InfoBox(None, "SKU-1234")
+
+    # Act
+    first.generate_image_from_text()
+    second.generate_image_from_text()
+
+    # Assert
+    assert cache.hits == 1 and cache.misses == 1
+    assert np.shares_memory(first.image.image_data, second.image.image_data)
+    assert second.get_actual_width() == len("SKU-1234") + 2
+
+def test_cached_image_is_immutable(cache):
+    # Arrange
+    first = InfoBox(None, "SKU-1234")
+    first.generate_image_from_text()
+    second = InfoBox(None, "SKU-1234")
+    second.generate_image_from_text()
+
+    # Act
+    second.image.set_pixel(1, 1, 1)
+    with pytest.raises(ValueError):
+        first.image.image_data[1, 1] = 1
+
+    # Assert
+    third = InfoBox(None, "SKU-1234")
+    third.generate_image_from_text()
+    assert third.image.get_pixel(1, 1) == 0
+
+def test_repeated_image_reuses_decoded_text(cache):
+    # Arrange
+    encoder = InfoBox(None, "SKU-1234")
+    encoder.generate_image_from_text()
+    rows = ["".join("*" if pixel else " " for pixel in row)
+            for row in encoder.image.image_data]
+
+    # Act
+    texts = []
+    for _ in range(3):
+        decoder = InfoBox(BarcodeImage(rows))
+        decoder.translate_image_to_text()
+        texts.append(decoder.text)
+
+    # Assert
+    assert texts == ["SKU-1234"] * 3
+    assert cache.hits == 2
+
+def test_cached_image_replaces_offset_scan(cache):
+    # Arrange
+    InfoBox(None, "Hello").generate_image_from_text()
+    pixels = np.zeros((20, 20), dtype=np.uint8)
+    offset = InfoBox(None, "parity", parity=True)
+    offset.generate_image_from_text()
+    height, width = offset.image.image_data.shape
+    pixels[5:5 + height, 4:4 + width] = offset.image.image_data
+    info_box = InfoBox(BarcodeImage.from_array(pixels))
+    info_box.translate_image_to_text()
+
+    # Act
+    info_box.read_text("Hello")
+    info_box.generate_image_from_text()
+    confidence = info_box.confidence
+    info_box.translate_image_to_text()
+
+    # Assert
+    assert confidence is None
+    assert info_box.spine_col == 0
+    assert info_box.text == "Hello"
+    assert info_box.render_image(frame=False).splitlines()[0] == "* * * * "
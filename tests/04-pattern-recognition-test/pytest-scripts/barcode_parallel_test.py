@@ -0,0 +1,59 @@
+import pytest
+
+from barcode_parallel import ParallelDecoder
+from stars_and_stripes import InfoBox
+
+# Test Data ----------------------------------------
+MESSAGES = [f"label {number:05d}" + "!" * (number % 7)
+            for number in range(500)]
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def decoder():
+    with ParallelDecoder(workers=2, chunk_size=64) as parallel_decoder:
+        yield parallel_decoder
+
+# ParallelDecoder ----------------------------------------
+def test_parallel_decode_keeps_input_order(decoder):
+    # Arrange
+    stack, _ = InfoBox.encode_batch(MESSAGES)
+
+    # Act
+    texts = decoder.decode(stack)
+
+    # Assert
+    assert texts == MESSAGES
+
+def test_small_batches_decode_in_process(decoder):
+    # Arrange
+    stack, _ = InfoBox.encode_batch(MESSAGES[:10])
+
+    # Act
+    texts = decoder.decode(stack)
+
+    # Assert
+    assert texts == MESSAGES[:10]
+    assert decoder.pool is None
+
+def test_images_are_stacked_straight_into_shared_memory(decoder, monkeypatch):
+    # Arrange
+    images = []
+    for message in MESSAGES:
+        info_box = InfoBox(None, message)
+        info_box.generate_image_from_text()
+        images.append(info_box.image)
+    stack_images = InfoBox.stack_images
+    outs = []
+
+    def stack_into(images, out = None):
+        outs.append(out)
+        return stack_images(images, out)
+
+    monkeypatch.setattr(InfoBox, "stack_images", stack_into)
+
+    # Act
+    texts = decoder.decode(images)
+
+    # Assert
+    assert texts == MESSAGES
+    assert len(outs) == 1 and outs[0] is not None
@@ -0,0 +1,158 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from barcode_raster import BarcodeRaster
+from stars_and_stripes import InfoBox
+
+# Test Data ----------------------------------------
+TEXT = "Wonderful, you are awesome!"
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def info_box():
+    info_box = InfoBox(None, TEXT)
+    info_box.generate_image_from_text()
+    return info_box
+
+def read_png(data):
+    """Returns the pixels of a 1-bit grayscale PNG, 1 for black."""
+    assert data.startswith(BarcodeRaster.PNG_SIGNATURE)
+    offset = len(BarcodeRaster.PNG_SIGNATURE)
+    chunks = {}
+    while offset < len(data):
+        (length,) = struct.unpack_from(">I", data, offset)
+        chunk_type = data[offset + 4:offset + 8]
+        chunks[chunk_type] = data[offset + 8:offset + 8 + length]
+        offset += length + 12
+    width, height = struct.unpack_from(">II", chunks[b"IHDR"])
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    rows = rows.reshape(height, -1)
+    assert not rows[:, 0].any()
+    return np.unpackbits(rows[:, 1:], axis=1, count=width) ^ 1
+
+# BarcodeRaster ----------------------------------------
+def test_raster_scales_and_pads(info_box):
+    # Act
+    raster = BarcodeRaster(scale=3, quiet_zone=2).get_raster(info_box.image)
+
+    # Assert
+    assert raster.shape == ((10 + 4) * 3, (len(TEXT) + 2 + 4) * 3)
+    assert not raster[:6].any() and not raster[:, :6].any()
+    assert np.array_equal(raster[6::3, 6::3][:10, :len(TEXT) + 2],
+                          info_box.image.image_data)
+
+def test_pbm_holds_packed_raster(info_box):
+    # Arrange
+    raster = BarcodeRaster()
+
+    # Act
+    data = raster.to_pbm(info_box.image)
+
+    # Assert
+    expected = raster.get_raster(info_box.image)
+    header = f"P4\n{expected.shape[1]} {expected.shape[0]}\n".encode()
+    assert data.startswith(header)
+    pixels = np.unpackbits(np.frombuffer(data[len(header):], dtype=np.uint8)
+                           .reshape(expected.shape[0], -1),
+                           axis=1, count=expected.shape[1])
+    assert np.array_equal(pixels, expected)
+
+def test_png_decodes_to_raster(info_box):
+    # Arrange
+    raster = BarcodeRaster(scale=2, quiet_zone=1)
+
+    # Act
+    data = raster.to_png(info_box.image)
+
+    # Assert
+    assert np.array_equal(read_png(data), raster.get_raster(info_box.image))
+
+def test_save_stack_picks_format_by_suffix(tmp_path):
+    # Arrange
+    stack, widths = InfoBox.encode_batch(["ab", "odd"])
+
+    # Act
+    paths = BarcodeRaster().save_stack(stack, widths, tmp_path / "{}.png")
+
+    # Assert
+    assert [path.name for path in paths] == ["0.png", "1.png"]
+    assert read_png(paths[1].read_bytes()).shape == ((10 + 4) * 4, (5 + 4) * 4)
+    with pytest.raises(ValueError):
+        BarcodeRaster().save(stack[0], tmp_path / "label.gif")
+
+def filter_png_rows(rows, filter_types):
+    """Applies the PNG row filters to 8-bit grayscale rows, the slow way."""
+    out = np.zeros((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+    previous = np.zeros(rows.shape[1], dtype=int)
+    for row_index, (row, filter_type) in enumerate(zip(rows.astype(int),
+                                                       filter_types)):
+        out[row_index, 0] = filter_type
+        for col, value in enumerate(row):
+            left = row[col - 1] if col else 0
+            up = previous[col]
+            up_left = previous[col - 1] if col else 0
+            estimate = left + up - up_left
+            gaps = [abs(estimate - left), abs(estimate - up),
+                    abs(estimate - up_left)]
+            paeth = [left, up, up_left][gaps.index(min(gaps))]
+            prediction = [0, left, up, (left + up) // 2, paeth][filter_type]
+            out[row_index, col + 1] = (value - prediction) % 256
+        previous = row
+    return out
+
+def make_gray_png(gray, filter_types):
+    raster = BarcodeRaster()
+    height, width = gray.shape
+    header = raster.PNG_HEADER_STRUCT.pack(width, height, 8, 0, 0, 0, 0)
+    rows = filter_png_rows(gray, filter_types)
+    return (raster.PNG_SIGNATURE + raster.make_png_chunk(b"IHDR", header) +
+            raster.make_png_chunk(b"IDAT", zlib.compress(rows.tobytes())) +
+            raster.make_png_chunk(b"IEND", b""))
+
+@pytest.mark.parametrize("suffix", [".png", ".pbm"])
+def test_exported_file_reads_back(tmp_path, info_box, suffix):
+    # Arrange
+    path = BarcodeRaster(scale=5).save(info_box.image, tmp_path / f"a{suffix}")
+
+    # Act
+    image = BarcodeRaster().read(path)
+
+    # Assert
+    assert np.array_equal(image.image_data, info_box.image.image_data)
+    assert BarcodeRaster().decode(path) == TEXT
+
+def test_noisy_gray_scan_decodes(info_box):
+    # Arrange
+    rng = np.random.default_rng(3)
+    dark = BarcodeRaster(scale=6).get_raster(info_box.image)
+    gray = np.where(dark, 40, 210) + rng.integers(-35, 35, dark.shape)
+    gray[::7, ::5] = np.where(dark[::7, ::5], 255, 0)
+    header = f"P5\n# scanner 2\n{gray.shape[1]} {gray.shape[0]}\n255\n"
+
+    # Act
+    text = BarcodeRaster().decode(header.encode() + gray.astype(np.uint8)
+                                  .tobytes())
+
+    # Assert
+    assert text == TEXT
+
+def test_png_row_filters_are_undone():
+    # Arrange
+    rng = np.random.default_rng(5)
+    gray = rng.integers(0, 256, (10, 9)).astype(np.uint8)
+    data = make_gray_png(gray, [0, 1, 2, 3, 4, 4, 3, 2, 1, 0])
+
+    # Act
+    pixels, maxval = BarcodeRaster().load_pixels(data)
+
+    # Assert
+    assert maxval == 255
+    assert np.array_equal(pixels, gray)
+
+def test_read_rejects_unknown_format():
+    # Assert
+    with pytest.raises(ValueError):
+        BarcodeRaster().read(b"GIF89a")
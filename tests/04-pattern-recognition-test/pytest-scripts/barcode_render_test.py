@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+
+from barcode_render import BarcodeRenderer
+from barcode_stream import BarcodeStreamReader
+from stars_and_stripes import BarcodeImage, InfoBox
+
+# Test Data ----------------------------------------
+MESSAGES = ["Wonderful, you are awesome!", "ab", "", "odd"]
+
+# BarcodeRenderer ----------------------------------------
+def test_write_messages_matches_display(capsys):
+    # Arrange
+    stream = io.StringIO()
+
+    # Act
+    count = BarcodeRenderer(stream, chunk_size=3).write_messages(MESSAGES)
+    for message in MESSAGES:
+        info_box = InfoBox(None, message)
+        info_box.generate_image_from_text()
+        info_box.display_image_to_console()
+
+    # Assert
+    assert count == len(MESSAGES)
+    assert stream.getvalue() == capsys.readouterr().out
+
+def test_rendered_log_reads_back():
+    # Arrange
+    stream = io.StringIO()
+    BarcodeRenderer(stream, chunk_size=2).write_messages(MESSAGES)
+
+    # Act
+    texts = list(BarcodeStreamReader(stream.getvalue().splitlines()))
+
+    # Assert
+    assert texts == MESSAGES
+
+def test_write_images_without_frame():
+    # Arrange
+    stream = io.StringIO()
+    image = BarcodeImage(np.array(["* * *", "*   *", "*****"]))
+
+    # Act
+    BarcodeRenderer(stream, frame=False).write_images([image])
+
+    # Assert
+    assert stream.getvalue() == "* * *\n*   *\n*****\n\n"
+
+def test_write_images_keeps_their_own_width():
+    # Arrange
+    stream = io.StringIO()
+    crop = np.zeros((5, 6), dtype=np.uint8)
+    crop[:3, :5] = BarcodeImage(np.array(["* * *", "*   *",
+                                          "*****"])).image_data
+    smudged = BarcodeImage(np.array(["* * *", "*   *", "**** "]))
+
+    # Act
+    renderer = BarcodeRenderer(stream, frame=False)
+    renderer.write_images([crop])
+    renderer.write_images([smudged])
+
+    # Assert
+    assert stream.getvalue() == ("* * * \n*   * \n***** \n      \n      \n\n"
+                                 "* * *\n*   *\n**** \n\n")
+
+def test_blocks_pack_two_rows_per_line():
+    # Arrange
+    info_box = InfoBox(BarcodeImage(np.array(["* * *", "*   *", "*****"])))
+
+    # Act
+    text = info_box.render_image(blocks=True, frame=False)
+
+    # Assert
+    assert text == "█ ▀ █\n▀▀▀▀▀\n"
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from barcode_scanner import BarcodeScanner
+from stars_and_stripes import BarcodeImage, InfoBox
+
+# Test Data ----------------------------------------
+MESSAGES = ["Wonderful, you are awesome!", "ab", "", "odd", "x" * 40, "sheet 7"]
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def sheet():
+    """Returns a canvas holding every message twice, plain and with parity,
+    scattered across a grid, and the (region, text) of every barcode in
+    reading order."""
+    canvas = np.zeros((80, 200), dtype=np.uint8)
+    barcodes = []
+    for row, parity in enumerate([False, True]):
+        stack, widths = InfoBox.encode_batch(MESSAGES, parity=parity)
+        left = 3
+        for message, pixels, width in zip(MESSAGES, stack, widths):
+            top = 4 + row * 30 + len(barcodes) % 3
+            height = len(pixels)
+            canvas[top:top + height, left:left + width] = pixels[:, :width]
+            barcodes.append(((top, left, height, int(width)), message))
+            left += width + 2
+    return canvas, sorted(barcodes)
+
+# BarcodeScanner ----------------------------------------
+def test_find_regions_locates_every_barcode(sheet):
+    # Arrange
+    canvas, barcodes = sheet
+
+    # Act
+    found = BarcodeScanner().find_regions(canvas)
+
+    # Assert
+    assert found == [region for region, _ in barcodes]
+
+def test_decode_returns_texts_in_reading_order(sheet):
+    # Arrange
+    canvas, barcodes = sheet
+    image = BarcodeImage.blank(*canvas.shape)
+    image.image_data[:] = canvas
+
+    # Act
+    texts, confidences = BarcodeScanner().decode(image, confidence=True)
+
+    # Assert
+    assert texts == [message for _, message in barcodes]
+    assert sum(confidence is not None for confidence in confidences) == 6
+
+def test_find_regions_ignores_noise():
+    # Arrange
+    rng = np.random.default_rng(7)
+    canvas = (rng.random((300, 300)) < 0.02).astype(np.uint8)
+    stack, widths = InfoBox.encode_batch(["noisy"])
+    canvas[100:110, 50:57] = stack[0]
+    canvas[99, 49:58] = canvas[110, 49:58] = 0
+    canvas[99:111, 49] = canvas[99:111, 57] = 0
+
+    # Act
+    found = BarcodeScanner().find_regions(canvas)
+
+    # Assert
+    assert found == [(100, 50, 10, 7)]
+
+def test_find_regions_blank_canvas():
+    # Assert
+    assert BarcodeScanner().find_regions(np.zeros((20, 20))) == []
+
+def test_barcodes_one_column_apart_stay_apart():
+    # Arrange
+    stack, widths = InfoBox.encode_batch(["odd", "next"])
+    canvas = np.zeros((14, 20), dtype=np.uint8)
+    canvas[2:12, 1:1 + widths[0]] = stack[0, :, :widths[0]]
+    left = 1 + widths[0] + 1
+    canvas[2:12, left:left + widths[1]] = stack[1, :, :widths[1]]
+
+    # Act
+    regions = BarcodeScanner().find_regions(canvas)
+    texts = BarcodeScanner().decode(canvas)
+    info_box = InfoBox(BarcodeImage.from_array(canvas))
+
+    # Assert
+    assert regions == [(2, 1, 10, 5), (2, 7, 10, 6)]
+    assert texts == ["odd", "next"]
+    assert info_box.text == "odd"
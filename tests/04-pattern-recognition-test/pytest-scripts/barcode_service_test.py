@@ -0,0 +1,111 @@
+import asyncio
+
+import numpy as np
+
+from barcode_service import BarcodeDecodeServer
+from stars_and_stripes import InfoBox
+
+# Test Data ----------------------------------------
+MESSAGES = ["Wonderful, you are awesome!", "ab", "odd", "Grüße"]
+
+# Helpers ----------------------------------------
+def encode(message):
+    info_box = InfoBox(None, message)
+    info_box.generate_image_from_text()
+    return info_box.image
+
+async def exchange(server, frames):
+    """Sends every frame on one connection and returns the responses by
+    request id."""
+    listener = await server.start(("127.0.0.1", 0))
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"".join(frames))
+        writer.write_eof()
+        responses = {}
+        for _ in frames:
+            request_id, status, text = (
+                await BarcodeDecodeServer.read_response(reader))
+            responses[request_id] = (status, text)
+        writer.close()
+        return responses
+    finally:
+        listener.close()
+        await server.close()
+
+# BarcodeDecodeServer ----------------------------------------
+def test_decodes_ascii_and_packed_frames():
+    # Arrange
+    frames = [BarcodeDecodeServer.pack_request(index, encode(message),
+                                               packed=index % 2 == 1)
+              for index, message in enumerate(MESSAGES)]
+
+    # Act
+    responses = asyncio.run(exchange(BarcodeDecodeServer(), frames))
+
+    # Assert
+    assert responses == {index: (BarcodeDecodeServer.STATUS_OK, message)
+                         for index, message in enumerate(MESSAGES)}
+
+def test_frames_in_one_window_share_a_batch(monkeypatch):
+    # Arrange
+    batches = []
+    decode_batch = InfoBox.decode_batch
+    monkeypatch.setattr(InfoBox, "decode_batch", lambda images: (
+        batches.append(len(images)) or decode_batch(images)))
+    frames = [BarcodeDecodeServer.pack_request(index, encode(message))
+              for index, message in enumerate(MESSAGES * 8)]
+
+    # Act
+    responses = asyncio.run(exchange(BarcodeDecodeServer(window=0.05),
+                                     frames))
+
+    # Assert
+    # the long message is stacked apart from the short ones
+    assert len(responses) == len(frames)
+    assert sorted(batches) == [8, 24]
+
+def test_bad_frame_gets_error_response():
+    # Arrange
+    bad = BarcodeDecodeServer.REQUEST_HEADER.pack(
+        7, BarcodeDecodeServer.FRAME_PACKED, 10, 3) + b"abc"
+    good = BarcodeDecodeServer.pack_request(8, encode("ok"))
+
+    # Act
+    responses = asyncio.run(exchange(BarcodeDecodeServer(), [bad, good]))
+
+    # Assert
+    assert responses[7][0] == BarcodeDecodeServer.STATUS_ERROR
+    assert responses[8] == (BarcodeDecodeServer.STATUS_OK, "ok")
+
+def test_frames_over_image_bounds_get_error_responses():
+    # Arrange
+    tall = BarcodeDecodeServer.REQUEST_HEADER.pack(
+        1, BarcodeDecodeServer.FRAME_PACKED, 8, 2000) + bytes(2000)
+    wide = b"*" * 20000 + b"\n*"
+    wide = BarcodeDecodeServer.REQUEST_HEADER.pack(
+        2, BarcodeDecodeServer.FRAME_ASCII, 0, len(wide)) + wide
+    good = BarcodeDecodeServer.pack_request(3, encode("ok"))
+
+    # Act
+    responses = asyncio.run(exchange(BarcodeDecodeServer(),
+                                     [tall, wide, good]))
+
+    # Assert
+    assert responses[1][0] == responses[2][0] == (
+        BarcodeDecodeServer.STATUS_ERROR)
+    assert "image bounds" in responses[1][1]
+    assert responses[3] == (BarcodeDecodeServer.STATUS_OK, "ok")
+
+def test_large_frame_is_not_stacked_with_small_ones():
+    # Arrange
+    small = [encode(message).image_data for message in MESSAGES[1:]]
+    large = np.zeros((1024, 16384), dtype=np.uint8)
+    server = BarcodeDecodeServer()
+
+    # Act
+    groups = server.group_frames(small + [large] + small)
+
+    # Assert
+    assert sorted(groups) == [[0, 1, 2, 4, 5, 6], [3]]
@@ -0,0 +1,83 @@
+import io
+import pytest
+
+from barcode_render import BarcodeRenderer
+from barcode_stream import BarcodeStreamReader
+from stars_and_stripes import InfoBox
+
+# Test Data ----------------------------------------
+MESSAGES = ["Wonderful, you are awesome!", "ab", "", "hello hello", "x" * 70]
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def ascii_barcodes():
+    """Returns every test message rendered as rows of '*' and spaces."""
+    stack, widths = InfoBox.encode_batch(MESSAGES)
+    return [["".join("*" if pixel else " " for pixel in row[:width])
+             for row in pixels] for pixels, width in zip(stack, widths)]
+
+@pytest.fixture
+def dump_file(tmp_path, ascii_barcodes):
+    """Writes the barcodes back to back, with noise between some of them."""
+    lines = ["scan batch 42", ""]
+    for index, rows in enumerate(ascii_barcodes):
+        lines.extend(rows)
+        if index % 2:
+            lines.extend(["-" * 20, "* * *", "*"])
+    path = tmp_path / "dump.txt"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+# BarcodeStreamReader ----------------------------------------
+def test_reader_decodes_every_barcode_in_file(dump_file):
+    # Act
+    texts = list(BarcodeStreamReader(dump_file))
+
+    # Assert
+    assert texts == MESSAGES
+
+def test_reader_decodes_in_small_batches(dump_file):
+    # Act
+    texts = list(BarcodeStreamReader(str(dump_file), batch_size=2))
+
+    # Assert
+    assert texts == MESSAGES
+
+def test_reader_accepts_console_output(capsys):
+    # Arrange
+    for message in MESSAGES[:2]:
+        info_box = InfoBox(None, message)
+        info_box.generate_image_from_text()
+        info_box.display_image_to_console()
+    console = io.StringIO(capsys.readouterr().out)
+
+    # Act
+    texts = list(BarcodeStreamReader(console))
+
+    # Assert
+    assert texts == MESSAGES[:2]
+
+def test_reader_skips_truncated_barcode(ascii_barcodes):
+    # Arrange
+    lines = ascii_barcodes[0][:6] + ascii_barcodes[1]
+
+    # Act
+    texts = list(BarcodeStreamReader(lines))
+
+    # Assert
+    assert texts == [MESSAGES[1]]
+
+@pytest.mark.parametrize("parity", [False, True])
+def test_reader_finds_every_layout(parity):
+    # Arrange
+    messages = ["plain", "Łódź", "📦 box", "again"]
+    stream = io.StringIO()
+    for frame in (True, False):
+        BarcodeRenderer(stream, frame=frame).write_messages(messages,
+                                                            parity=parity)
+
+    # Act
+    texts = list(BarcodeStreamReader(stream.getvalue().splitlines()))
+
+    # Assert
+    assert texts == messages * 2
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# make the pattern recognition sources importable as top-level modules
+SRC_DIR = (Path(__file__).resolve().parents[3] / "projects" /
+           "01-pattern-recognition" / "src")
+sys.path.insert(0, str(SRC_DIR))
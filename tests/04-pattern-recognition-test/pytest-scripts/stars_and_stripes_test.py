@@ -0,0 +1,655 @@
+import pytest
+import numpy as np
+
+from stars_and_stripes import BarcodeABC, BarcodeImage, InfoBox
+
+# Test Data ----------------------------------------
+WONDERFUL_IMAGE = [
+    "* * * * * * * * * * * * * * *",
+    "*                           *",
+    "**********  *** *** *******  ",
+    "* ***************************",
+    "**    * *   * *  *   * *     ",
+    "* **     ** **          **  *",
+    "****** ****  **   *  ** ***  ",
+    "****  **     *   *   * **   *",
+    "***  *  *   *** * * ******** ",
+    "*****************************"]
+WONDERFUL_TEXT = "Wonderful, you are awesome!"
+FOOTHILL_IMAGE = [
+    "* * * * * * * * * * * * * * *",
+    "*                           *",
+    "*** ** ******** ** ***** *** ",
+    "*  **** ***************** ***",
+    "* *  *    *      *  *  *  *  ",
+    "*       ** **** *          **",
+    "*    * ****  **    * * * *** ",
+    "***    ***       * **    * **",
+    "*** *   **  *   ** * **   *  ",
+    "*****************************"]
+FOOTHILL_TEXT = "CS at Foothill is great Fun"
+
+# Fixtures ----------------------------------------
+@pytest.fixture
+def wonderful_image():
+    return BarcodeImage(np.array(WONDERFUL_IMAGE))
+
+# BarcodeImage ----------------------------------------
+def test_image_is_numpy_array(wonderful_image):
+    # Assert
+    assert isinstance(wonderful_image.image_data, np.ndarray)
+    assert wonderful_image.image_data.dtype == np.uint8
+
+def test_image_sized_to_content(wonderful_image):
+    # Arrange
+    bottom_row = len(WONDERFUL_IMAGE) - 1
+
+    # Assert
+    assert wonderful_image.image_data.shape == (10, 29)
+    assert wonderful_image.get_row(bottom_row).all()
+    assert wonderful_image.get_pixel(0, 0) == 1
+    assert wonderful_image.get_pixel(0, 1) == 0
+    assert wonderful_image.get_col(0).all()
+
+def test_pixel_accessors_respect_bounds(wonderful_image):
+    # Act / Assert
+    assert wonderful_image.set_pixel(1, 1, 1)
+    assert wonderful_image.get_pixel(1, 1) == 1
+    assert not wonderful_image.set_pixel(wonderful_image.get_height(), 0, 1)
+    assert wonderful_image.get_pixel(0, wonderful_image.get_width()) is False
+
+def test_row_and_col_are_views(wonderful_image):
+    # Act
+    wonderful_image.get_row(3)[4] = 1
+
+    # Assert
+    assert wonderful_image.get_col(4)[3] == 1
+
+def test_packed_data_round_trips(wonderful_image):
+    # Act
+    packed = wonderful_image.get_packed_data()
+    unpacked = np.unpackbits(packed, axis=1,
+                             count=wonderful_image.get_width())
+
+    # Assert
+    assert np.array_equal(unpacked, wonderful_image.image_data)
+
+def test_oversized_data_leaves_image_empty():
+    # Arrange
+    too_wide = ["*" * 30]
+
+    # Act
+    image = BarcodeImage(too_wide, max_width=29)
+
+    # Assert
+    assert image.image_data.shape == (0, 0)
+
+def test_view_shares_pixels_copy_on_write(wonderful_image):
+    # Arrange
+    view = wonderful_image.get_view()
+
+    # Assert shared before either side writes
+    assert np.shares_memory(view.image_data, wonderful_image.image_data)
+    assert view.is_shared() and wonderful_image.is_shared()
+
+    # Act
+    view.set_pixel(1, 1, 1)
+
+    # Assert only the written side copied
+    assert not np.shares_memory(view.image_data, wonderful_image.image_data)
+    assert view.get_pixel(1, 1) == 1
+    assert wonderful_image.get_pixel(1, 1) == 0
+
+def test_copy_is_isolated(wonderful_image):
+    # Act
+    copied = wonderful_image.copy()
+    copied.set_pixel(1, 1, 1)
+
+    # Assert
+    assert not copied.is_shared()
+    assert wonderful_image.get_pixel(1, 1) == 0
+
+def test_from_array_wraps_without_copy():
+    # Arrange
+    pixels = BarcodeImage(np.array(WONDERFUL_IMAGE)).image_data.copy()
+
+    # Act
+    image = BarcodeImage.from_array(pixels)
+    flags = BarcodeImage.from_array(pixels.astype(bool))
+
+    # Assert
+    assert image.image_data is pixels
+    assert flags.image_data.dtype == BarcodeImage.PIXEL_DTYPE
+    assert np.array_equal(flags.image_data, pixels)
+    with pytest.raises(ValueError):
+        BarcodeImage.from_array(pixels[0])
+
+def test_from_buffer_shares_bytes_copy_on_write():
+    # Arrange
+    buffer = bytes([1, 0, 1, 1, 1, 1])
+
+    # Act
+    image = BarcodeImage.from_buffer(buffer, 3)
+    image.set_pixel(0, 1, True)
+
+    # Assert
+    assert image.get_height() == 2 and image.get_width() == 3
+    assert image.get_pixel(0, 1) == 1
+    assert buffer[1] == 0
+    with pytest.raises(ValueError):
+        BarcodeImage.from_buffer(buffer, 4)
+
+def test_from_buffer_bytearray_writes_through():
+    # Arrange
+    buffer = bytearray(6)
+
+    # Act
+    image = BarcodeImage.from_buffer(memoryview(buffer), 2)
+    image.set_pixel(2, 1, True)
+
+    # Assert
+    assert buffer[5] == 1
+
+@pytest.mark.parametrize("lines", [WONDERFUL_IMAGE,
+                                   ["* *", "*", "", "****", "*  *"]])
+def test_from_ascii_matches_parse_lines(lines):
+    # Act
+    image = BarcodeImage.from_ascii("\r\n".join(lines) + "\r\n")
+
+    # Assert
+    assert np.array_equal(image.image_data, BarcodeImage.parse_lines(lines))
+
+def test_from_ascii_buffer_decodes():
+    # Arrange
+    buffer = memoryview("\n".join(FOOTHILL_IMAGE).encode("ascii"))
+
+    # Act
+    decoder = InfoBox(BarcodeImage.from_ascii(buffer))
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert decoder.text == FOOTHILL_TEXT
+
+def test_image_holds_no_parsing_state(wonderful_image):
+    # Assert
+    assert not hasattr(wonderful_image, "__dict__")
+    with pytest.raises(AttributeError):
+        wonderful_image.active_row = 0
+
+# InfoBox ----------------------------------------
+def test_translate_image_to_text(wonderful_image):
+    # Arrange
+    info_box = InfoBox(wonderful_image)
+
+    # Act
+    info_box.translate_image_to_text()
+
+    # Assert
+    assert info_box.text == WONDERFUL_TEXT
+
+@pytest.mark.parametrize("text", ["a", "ab", "Hi!", "even", WONDERFUL_TEXT,
+                                  "long payload " * 20])
+def test_generate_then_translate_round_trips(text):
+    # Arrange
+    info_box = InfoBox(None, text)
+
+    # Act
+    info_box.generate_image_from_text()
+    info_box.translate_image_to_text()
+
+    # Assert
+    assert info_box.get_actual_width() == len(text) + 2
+    assert info_box.text == text
+
+def test_generate_matches_scanned_image(wonderful_image):
+    # Arrange
+    info_box = InfoBox(None, WONDERFUL_TEXT)
+
+    # Act
+    info_box.generate_image_from_text()
+
+    # Assert
+    assert np.array_equal(info_box.image.image_data,
+                          wonderful_image.image_data)
+
+def test_generate_refuses_messages_past_max_width():
+    # Arrange
+    info_box = InfoBox(None, "x" * (BarcodeImage.MAX_WIDTH - 1))
+
+    # Act / Assert
+    assert not info_box.generate_image_from_text()
+
+def test_scan_does_not_copy_pixels(wonderful_image):
+    # Act
+    info_box = InfoBox(wonderful_image)
+
+    # Assert
+    assert np.shares_memory(info_box.image.image_data,
+                            wonderful_image.image_data)
+
+def test_scan_is_unaffected_by_later_writes(wonderful_image):
+    # Arrange
+    info_box = InfoBox(wonderful_image)
+
+    # Act
+    wonderful_image.set_pixel(2, 1, 0)
+    info_box.translate_image_to_text()
+
+    # Assert
+    assert info_box.text == WONDERFUL_TEXT
+
+def test_scan_isolate_copies_pixels(wonderful_image):
+    # Arrange
+    info_box = InfoBox()
+
+    # Act
+    info_box.scan(wonderful_image, isolate=True)
+
+    # Assert
+    assert not np.shares_memory(info_box.image.image_data,
+                                wonderful_image.image_data)
+    assert not wonderful_image.is_shared()
+
+def test_column_table_holds_bits_of_every_byte():
+    # Act
+    values = InfoBox.BIT_WEIGHTS @ InfoBox.COLUMN_TABLE
+
+    # Assert
+    assert InfoBox.COLUMN_TABLE.shape == (InfoBox.BITS_PER_CHAR, 256)
+    assert list(values) == list(range(256))
+
+def embed(pixels, top, left, height=40, width=80):
+    canvas = BarcodeImage.blank(height, width)
+    canvas.image_data[top:top + pixels.shape[0],
+                      left:left + pixels.shape[1]] = pixels
+    return canvas
+
+def test_find_bounding_box_at_offset(wonderful_image):
+    # Arrange
+    canvas = embed(wonderful_image.image_data, 7, 23)
+
+    # Act
+    box = InfoBox.find_bounding_box(canvas.image_data)
+
+    # Assert
+    assert box == (7, 23, 10, len(WONDERFUL_TEXT) + 2)
+
+def test_find_bounding_box_blank_canvas():
+    # Assert
+    assert InfoBox.find_bounding_box(BarcodeImage.blank(5, 5).image_data) is None
+
+@pytest.mark.parametrize("text", ["ab", "odd", WONDERFUL_TEXT])
+def test_translate_image_at_offset(text):
+    # Arrange
+    info_box = InfoBox(None, text)
+    info_box.generate_image_from_text()
+    canvas = embed(info_box.image.image_data, 12, 5)
+
+    # Act
+    decoder = InfoBox(canvas)
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert decoder.get_actual_height() == 12
+    assert decoder.spine_col == 5
+    assert decoder.get_actual_width() == len(text) + 2
+    assert decoder.text == text
+
+def test_info_box_uses_slots(wonderful_image):
+    # Act
+    decoder = InfoBox(wonderful_image)
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert not hasattr(decoder, "__dict__")
+    assert decoder.text == WONDERFUL_TEXT
+    # the scanned view is the only image kept, under either name
+    assert decoder.bc is decoder.image
+    assert decoder.image is not wonderful_image
+    assert BarcodeABC.__slots__ == ()
+
+# Batch Methods ----------------------------------------
+def test_decode_batch_from_string_arrays():
+    # Act
+    texts = InfoBox.decode_batch([np.array(WONDERFUL_IMAGE),
+                                  FOOTHILL_IMAGE])
+
+    # Assert
+    assert texts == [WONDERFUL_TEXT, FOOTHILL_TEXT]
+
+def test_decode_batch_from_pixel_stack():
+    # Arrange
+    messages = ["a", "ab", "", "Who are you? I'm vengeance!"]
+    images = []
+    for message in messages:
+        info_box = InfoBox(None, message)
+        info_box.generate_image_from_text()
+        images.append(info_box.image.image_data)
+    stack = InfoBox.stack_images(images)
+
+    # Act
+    texts = InfoBox.decode_batch(stack)
+
+    # Assert
+    assert texts == messages
+
+def test_decode_batch_blank_image_decodes_empty():
+    # Act
+    texts = InfoBox.decode_batch(np.zeros((2, 12, 8), dtype=np.uint8))
+
+    # Assert
+    assert texts == ["", ""]
+
+def test_encode_batch_matches_single_encode():
+    # Arrange
+    messages = [WONDERFUL_TEXT, "ab", ""]
+
+    # Act
+    stack, widths = InfoBox.encode_batch(messages)
+
+    # Assert
+    assert stack.shape == (3, InfoBox.BITS_PER_CHAR + 2, len(WONDERFUL_TEXT) + 2)
+    assert stack.flags["C_CONTIGUOUS"]
+    assert list(widths) == [29, 4, 2]
+    for message, pixels, width in zip(messages, stack, widths):
+        info_box = InfoBox(None, message)
+        info_box.generate_image_from_text()
+        expected = info_box.image.image_data[-len(pixels):, :width]
+        assert np.array_equal(pixels[:, :width], expected)
+        assert not pixels[:, width:].any()
+
+def test_encode_batch_round_trips_through_decode_batch():
+    # Arrange
+    messages = ["x" * length for length in range(1, 40)]
+
+    # Act
+    stack, widths = InfoBox.encode_batch(messages)
+
+    # Assert
+    assert InfoBox.decode_batch(stack) == messages
+
+def test_stack_images_into_given_array():
+    # Arrange
+    images = [np.array(["* * *", "*   *", "*****"]), np.array(["***"])]
+    out = np.ones((2, 3, 5), dtype=np.uint8)
+
+    # Act
+    stack = InfoBox.stack_images(images, out=out)
+
+    # Assert
+    assert stack is out
+    assert np.array_equal(out, InfoBox.stack_images(images))
+    with pytest.raises(ValueError):
+        InfoBox.stack_images(images, out=np.zeros((2, 3, 4), dtype=np.uint8))
+
+# Error Correction ----------------------------------------
+def parity_image(text):
+    info_box = InfoBox(None, text, parity=True)
+    info_box.generate_image_from_text()
+    return info_box.image.copy()
+
+def flip(image, row, col):
+    image.set_pixel(row, col, not image.get_pixel(row, col))
+
+@pytest.mark.parametrize("text", ["a", "ab", WONDERFUL_TEXT])
+def test_parity_image_round_trips(text):
+    # Arrange
+    decoder = InfoBox(parity_image(text))
+
+    # Act
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert decoder.image.get_height() == InfoBox.BITS_PER_CHAR + 3
+    assert decoder.parity
+    assert decoder.text == text
+    assert np.array_equal(decoder.confidence, np.ones(len(text)))
+
+def test_plain_image_has_no_confidence(wonderful_image):
+    # Act
+    decoder = InfoBox(wonderful_image)
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert not decoder.parity
+    assert decoder.confidence is None
+
+def test_parity_corrects_single_flipped_bit():
+    # Arrange
+    image = parity_image(WONDERFUL_TEXT)
+    flip(image, 4, 6)
+    decoder = InfoBox(image)
+
+    # Act
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert decoder.text == WONDERFUL_TEXT
+    assert decoder.confidence[5] == 0.5
+    assert decoder.confidence.sum() == len(WONDERFUL_TEXT) - 0.5
+
+def test_parity_flags_uncorrectable_columns():
+    # Arrange
+    image = parity_image(WONDERFUL_TEXT)
+    flip(image, 4, 6)
+    flip(image, 5, 9)
+
+    # Act
+    texts, confidences = InfoBox.decode_batch([image], confidence=True)
+
+    # Assert
+    assert list(np.flatnonzero(confidences[0] == 0.0)) == [5, 8]
+
+def test_width_survives_smudged_top_border(wonderful_image):
+    # Arrange
+    wonderful_image.set_pixel(0, 14, False)
+    decoder = InfoBox(wonderful_image)
+
+    # Act
+    decoder.translate_image_to_text()
+    texts = InfoBox.decode_batch([wonderful_image.image_data])
+
+    # Assert
+    assert decoder.get_actual_width() == len(WONDERFUL_TEXT) + 2
+    assert decoder.text == texts[0] == WONDERFUL_TEXT
+
+@pytest.mark.parametrize("text", ["A\xaa", "\xaaB", "hello\xaaworld"])
+def test_width_survives_smudged_bottom_border(text):
+    # Arrange
+    encoder = InfoBox(None, text)
+    encoder.generate_image_from_text()
+    # 0xAA columns alternate like the open right border
+    pixels = encoder.image.image_data.copy()
+    pixels[-1, 1] = 0
+
+    # Act
+    decoder = InfoBox(BarcodeImage.from_array(pixels))
+    texts = InfoBox.decode_batch([pixels])
+
+    # Assert
+    assert decoder.get_actual_width() == len(text) + 2
+    assert decoder.text == texts[0] == text
+
+def test_batch_parity_matches_single_encode_and_corrects():
+    # Arrange
+    messages = [WONDERFUL_TEXT, "ab", "x"]
+    stack, widths = InfoBox.encode_batch(messages, parity=True)
+    stack[1, 3, 2] ^= 1
+
+    # Act
+    texts, confidences = InfoBox.decode_batch(
+        list(stack) + [np.array(FOOTHILL_IMAGE)], confidence=True)
+
+    # Assert
+    assert list(widths) == [30, 5, 4]
+    for message, pixels, width in zip(messages, stack, widths):
+        expected = parity_image(message)
+        if message == "ab":
+            flip(expected, 3, 2)
+        assert np.array_equal(pixels[:, :width], expected.image_data)
+    assert texts == messages + [FOOTHILL_TEXT]
+    assert list(confidences[1]) == [1.0, 0.5]
+    assert confidences[3] is None
+
+# Wide Characters ----------------------------------------
+WIDE_TEXTS = ["Grüße aus Köln", "東京都 — 配送", "📦 to Zürich", "κόσμε"]
+
+@pytest.mark.parametrize("text", WIDE_TEXTS)
+def test_wide_text_round_trips(text):
+    # Arrange
+    info_box = InfoBox(None, text)
+
+    # Act
+    info_box.generate_image_from_text()
+    decoder = InfoBox(info_box.image)
+    decoder.translate_image_to_text()
+
+    # Assert
+    expected_bits = 8 if max(map(ord, text)) < 256 else 16
+    assert info_box.image.get_height() == expected_bits + 2
+    assert decoder.char_bits == expected_bits
+    assert decoder.text == text
+
+def test_char_bits_sets_column_depth():
+    # Arrange
+    wide = InfoBox(None, "📦 ok", char_bits=32)
+    narrow = InfoBox(None, "東京", char_bits=8)
+
+    # Act
+    wide.generate_image_from_text()
+    decoder = InfoBox(wide.image)
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert wide.image.get_height() == 34
+    assert wide.get_actual_width() == len("📦 ok") + 2
+    assert decoder.text == "📦 ok"
+    assert not narrow.generate_image_from_text()
+    with pytest.raises(ValueError):
+        InfoBox.encode_batch(["東京"], char_bits=8)
+
+def test_wide_parity_corrects_single_flipped_bit():
+    # Arrange
+    info_box = InfoBox(None, WIDE_TEXTS[1], parity=True)
+    info_box.generate_image_from_text()
+    image = info_box.image.copy()
+    image.set_pixel(5, 3, not image.get_pixel(5, 3))
+
+    # Act
+    decoder = InfoBox(image)
+    decoder.translate_image_to_text()
+
+    # Assert
+    assert decoder.parity and decoder.char_bits == 16
+    assert decoder.text == WIDE_TEXTS[1]
+    assert decoder.confidence[2] == 0.5
+
+def test_batch_decodes_mixed_column_depths():
+    # Arrange
+    wide, _ = InfoBox.encode_batch(WIDE_TEXTS)
+    wide_parity, _ = InfoBox.encode_batch(WIDE_TEXTS[1:2], parity=True)
+    plain, _ = InfoBox.encode_batch(["plain"])
+
+    # Act
+    texts = InfoBox.decode_batch(list(wide) + list(wide_parity) +
+                                 list(plain))
+
+    # Assert
+    assert wide.shape[1] == 18
+    assert texts == WIDE_TEXTS + WIDE_TEXTS[1:2] + ["plain"]
+
+# Lazy Decoding ----------------------------------------
+def count_calls(monkeypatch, name):
+    calls = []
+    method = getattr(InfoBox, name)
+
+    def counted(self, *args):
+        calls.append(args)
+        return method(self, *args)
+
+    monkeypatch.setattr(InfoBox, name, counted)
+    return calls
+
+def test_scan_defers_measuring_and_decoding(monkeypatch, wonderful_image):
+    # Arrange
+    measured = count_calls(monkeypatch, "compute_signal_height")
+    decoded = count_calls(monkeypatch, "translate_image_to_text")
+
+    # Act
+    info_box = InfoBox(wonderful_image)
+
+    # Assert
+    assert not measured and not decoded
+
+def test_width_does_not_decode(monkeypatch, wonderful_image):
+    # Arrange
+    decoded = count_calls(monkeypatch, "translate_image_to_text")
+    info_box = InfoBox(wonderful_image)
+
+    # Act
+    width = info_box.get_actual_width()
+
+    # Assert
+    assert width == len(WONDERFUL_IMAGE[0])
+    assert info_box.spine_length == len(WONDERFUL_IMAGE)
+    assert not decoded
+
+def test_text_is_decoded_once_on_first_access(monkeypatch, wonderful_image):
+    # Arrange
+    measured = count_calls(monkeypatch, "compute_signal_height")
+    decoded = count_calls(monkeypatch, "translate_image_to_text")
+    info_box = InfoBox(wonderful_image)
+
+    # Act
+    texts = [info_box.text, info_box.text]
+
+    # Assert
+    assert texts == [WONDERFUL_TEXT] * 2
+    assert len(measured) == len(decoded) == 1
+
+def test_read_text_replaces_pending_decode(wonderful_image):
+    # Arrange
+    info_box = InfoBox(wonderful_image)
+
+    # Act
+    info_box.read_text("routed")
+
+    # Assert
+    assert info_box.text == "routed"
+
+def test_generate_after_scan_replaces_scanned_image(wonderful_image):
+    # Arrange
+    info_box = InfoBox(wonderful_image)
+    info_box.read_text("Hi")
+
+    # Act
+    info_box.generate_image_from_text()
+    info_box.translate_image_to_text()
+
+    # Assert
+    assert info_box.get_actual_width() == 4
+    assert info_box.image.get_width() == 4
+    assert info_box.text == "Hi"
+
+@pytest.mark.parametrize("text, char_bits", [("x" * 20000, None),
+                                             ("\u20ac", 8)])
+def test_refused_text_keeps_scanned_image(wonderful_image, text, char_bits):
+    # Arrange
+    info_box = InfoBox(wonderful_image, char_bits=char_bits)
+    info_box.read_text(text)
+
+    # Act
+    generated = info_box.generate_image_from_text()
+
+    # Assert
+    assert not generated
+    assert info_box.get_actual_width() == info_box.image.get_width() == 29
+    assert info_box.spine_length == len(WONDERFUL_IMAGE)
+
+def test_blank_scan_has_no_text():
+    # Act
+    info_box = InfoBox(BarcodeImage.blank(10, 10))
+
+    # Assert
+    assert info_box.text is None
+    assert info_box.get_actual_width() == 0